@@ -0,0 +1,106 @@
+import os
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+
+class IngestInterrupted(Exception):
+    pass
+
+
+class CheckpointStore:
+    """Offsets já carregados por tabela, arquivo e fatia, gravados na mesma transação de cada lote.
+
+    Como o checkpoint e o lote são confirmados juntos, uma carga retomada nunca
+    repete nem pula registros. O tamanho e a data de modificação do arquivo são
+    guardados para recusar a retomada se o dump mudou entre as execuções, e o
+    fim de cada fatia, para recusá-la se o tamanho das fatias mudou.
+    """
+
+    DDL = """
+        CREATE TABLE IF NOT EXISTS ingest_checkpoint (
+            table_name TEXT NOT NULL,
+            shard_start BIGINT NOT NULL,
+            shard_end BIGINT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_size BIGINT NOT NULL,
+            file_mtime DOUBLE PRECISION NOT NULL,
+            position BIGINT NOT NULL,
+            rows BIGINT NOT NULL DEFAULT 0,
+            done BOOLEAN NOT NULL DEFAULT FALSE,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (table_name, shard_start, shard_end)
+        )
+    """
+
+    def ensure(self, session: Session):
+        session.execute(text(self.DDL))
+        session.commit()
+
+    def clear(self, session: Session):
+        # Recriada em vez de esvaziada: uma tabela de uma versão anterior não tem shard_end
+        session.execute(text("DROP TABLE IF EXISTS ingest_checkpoint"))
+        self.ensure(session)
+
+    def load(self, session: Session, table: str, filepath: str, shard_start: int, shard_end: int):
+        """Retorna (position, rows, done) salvos para a fatia, ou None se ela nunca foi iniciada."""
+        self.ensure(session)
+        # Qualquer checkpoint que se sobreponha à fatia: com outro tamanho de fatia os intervalos não coincidem
+        overlapping = session.execute(
+            text(
+                "SELECT shard_start, shard_end, file_path, file_size, file_mtime, position, rows, done "
+                "FROM ingest_checkpoint "
+                "WHERE table_name = :table AND shard_start < :shard_end AND shard_end > :shard_start"
+            ),
+            {"table": table, "shard_start": shard_start, "shard_end": shard_end},
+        ).all()
+        if not overlapping:
+            return None
+
+        saved = overlapping[0]
+        if len(overlapping) > 1 or (saved.shard_start, saved.shard_end) != (shard_start, shard_end):
+            raise RuntimeError(
+                f"As fatias de {table} mudaram desde o último checkpoint; "
+                "retome com o mesmo --shard-size ou recarregue do zero (sem --resume)."
+            )
+
+        stat = os.stat(filepath)
+        if (saved.file_path, saved.file_size, saved.file_mtime) != (filepath, stat.st_size, stat.st_mtime):
+            raise RuntimeError(
+                f"O arquivo de {table} mudou desde o último checkpoint; "
+                "recarregue do zero (sem --resume) ou use --delta."
+            )
+        return saved.position, saved.rows, saved.done
+
+    def save(
+        self, session: Session, table: str, filepath: str, shard_start: int, shard_end: int,
+        position: int, rows: int, done=False,
+    ):
+        """Registra o offset alcançado; deve ser chamado antes do commit do lote correspondente."""
+        stat = os.stat(filepath)
+        session.execute(
+            text("""
+                INSERT INTO ingest_checkpoint
+                    (table_name, shard_start, shard_end, file_path, file_size, file_mtime, position, rows, done)
+                VALUES (:table, :shard_start, :shard_end, :file_path, :file_size, :file_mtime, :position, :rows, :done)
+                ON CONFLICT (table_name, shard_start, shard_end) DO UPDATE SET
+                    file_path = EXCLUDED.file_path,
+                    file_size = EXCLUDED.file_size,
+                    file_mtime = EXCLUDED.file_mtime,
+                    position = EXCLUDED.position,
+                    rows = EXCLUDED.rows,
+                    done = EXCLUDED.done,
+                    updated_at = now()
+            """),
+            {
+                "table": table,
+                "shard_start": shard_start,
+                "shard_end": shard_end,
+                "file_path": filepath,
+                "file_size": stat.st_size,
+                "file_mtime": stat.st_mtime,
+                "position": position,
+                "rows": rows,
+                "done": done,
+            },
+        )
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+from sqlmodel import SQLModel
+
+from src.app.core.db.database import engine
+
+
+class DeferredConstraints:
+    """Remove FKs e índices secundários das tabelas antes de uma carga em massa e os recria no final.
+
+    As chaves primárias ficam, porque o filtro de órfãos e o ON CONFLICT dependem
+    delas. As definições são capturadas do catálogo (pg_get_constraintdef e
+    pg_get_indexdef) e guardadas na tabela ingest_deferred_ddl antes de qualquer
+    remoção, então uma carga interrompida pode ser retomada e ainda restaurar
+    exatamente o mesmo esquema. Na restauração os índices são construídos em
+    paralelo, as FKs entram como NOT VALID e são validadas de uma vez, e as
+    tabelas passam por ANALYZE.
+    """
+
+    DDL = """
+        CREATE TABLE IF NOT EXISTS ingest_deferred_ddl (
+            name TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            definition TEXT NOT NULL
+        )
+    """
+
+    def __init__(self, tables=None, workers: int = 4, maintenance_work_mem: str = "512MB"):
+        self.tables = list(tables or (table.name for table in SQLModel.metadata.sorted_tables))
+        self.workers = workers
+        self.maintenance_work_mem = maintenance_work_mem
+
+    def capture(self, connection) -> list:
+        """Lista (nome, tabela, tipo, definição) das FKs e dos índices secundários das tabelas gerenciadas."""
+        foreign_keys = connection.execute(text("""
+            SELECT c.conname, t.relname, pg_get_constraintdef(c.oid)
+            FROM pg_constraint c
+            JOIN pg_class t ON t.oid = c.conrelid
+            JOIN pg_class r ON r.oid = c.confrelid
+            WHERE c.contype = 'f' AND (t.relname = ANY(:tables) OR r.relname = ANY(:tables))
+        """), {"tables": self.tables}).all()
+        indexes = connection.execute(text("""
+            SELECT ic.relname, t.relname, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            WHERE t.relname = ANY(:tables)
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid AND c.contype IN ('p', 'u', 'x')
+              )
+        """), {"tables": self.tables}).all()
+
+        captured = [(name, table, "foreign", definition) for name, table, definition in foreign_keys]
+        captured += [(name, table, "index", definition) for name, table, definition in indexes]
+        return sorted(captured)
+
+    def saved(self, connection) -> list:
+        connection.execute(text(self.DDL))
+        rows = connection.execute(text("SELECT name, table_name, kind, definition FROM ingest_deferred_ddl"))
+        return sorted(tuple(row) for row in rows)
+
+    def drop(self):
+        with engine.begin() as connection:
+            if self.saved(connection):
+                print("Restrições já estavam removidas por uma carga anterior; mantendo as definições salvas.")
+                return
+
+            captured = self.capture(connection)
+            connection.execute(
+                text("INSERT INTO ingest_deferred_ddl (name, table_name, kind, definition) VALUES (:n, :t, :k, :d)"),
+                [{"n": name, "t": table, "k": kind, "d": definition} for name, table, kind, definition in captured],
+            )
+
+            for name, table, kind, _ in captured:
+                if kind == "foreign":
+                    connection.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS "{name}"'))
+                else:
+                    connection.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+
+        print(f"{len(captured)} FKs e índices secundários removidos de {', '.join(self.tables)} durante a carga.")
+
+    def _execute_all(self, statements: list):
+        def execute(statement):
+            with engine.connect() as connection:
+                connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+                connection.execute(text(f"SET maintenance_work_mem = '{self.maintenance_work_mem}'"))
+                connection.execute(text(statement))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(execute, statements))
+
+    def restore(self):
+        with engine.begin() as connection:
+            saved = self.saved(connection)
+            # Uma restauração anterior pode ter parado no meio; o que já existe é mantido
+            present = {(name, kind) for name, _, kind, _ in self.capture(connection)}
+
+        pending = [entry for entry in saved if (entry[0], entry[2]) not in present]
+        indexes = [definition for _, _, kind, definition in pending if kind == "index"]
+        foreign = [(name, table, definition) for name, table, kind, definition in pending if kind == "foreign"]
+
+        self._execute_all(indexes)
+
+        with engine.begin() as connection:
+            for name, table, definition in foreign:
+                connection.execute(text(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition} NOT VALID'))
+
+        self._execute_all([f'ALTER TABLE {table} VALIDATE CONSTRAINT "{name}"' for name, table, _ in foreign])
+        self._execute_all([f"ANALYZE {table}" for table in self.tables])
+
+        with engine.begin() as connection:
+            restored = self.capture(connection)
+            if restored != saved:
+                missing = sorted(set(saved) - set(restored))
+                raise RuntimeError(f"O esquema restaurado difere do original: {missing}")
+            connection.execute(text("DELETE FROM ingest_deferred_ddl"))
+
+        print(f"{len(saved)} FKs e índices secundários recriados e validados; tabelas analisadas.")
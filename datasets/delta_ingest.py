@@ -0,0 +1,129 @@
+import time
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from datasets.imdb_data_service import DERIVED_TABLES, FOREIGN_KEYS, MODELS, IMDbDataService, sync_derived
+from datasets.parallel_loader import DEPENDENCIES
+from src.app.core.db.database import engine
+
+
+def _load_order() -> list:
+    """Tabelas em ordem topológica: as referenciadas antes das que as referenciam."""
+    order = []
+    while len(order) < len(DEPENDENCIES):
+        for table, parents in DEPENDENCIES.items():
+            if table not in order and all(parent in order for parent in parents):
+                order.append(table)
+    return order
+
+
+class DeltaIngestService(IMDbDataService):
+    """Atualiza o banco a partir de um dump novo aplicando só o que mudou.
+
+    Cada dump é copiado para uma tabela temporária e cada registro recebe uma
+    impressão digital (md5 da linha). Registros novos ou com impressão diferente
+    da versão já carregada entram por INSERT ... ON CONFLICT DO UPDATE, e registros
+    ausentes do dump são removidos. Tudo acontece em uma única transação.
+    """
+
+    def __init__(self, datasets: dict, batch_size: int = 100_000):
+        super().__init__(datasets, mode="copy", batch_size=batch_size)
+        self.changes = {}
+
+    @staticmethod
+    def _columns(table: str):
+        columns = [column.name for column in MODELS[table].__table__.columns]
+        keys = [column.name for column in MODELS[table].__table__.primary_key.columns]
+        return columns, keys
+
+    def stage_table(self, session: Session, table: str) -> int:
+        _, keys = self._columns(table)
+        staging = f"delta_{table}"
+        session.execute(text(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"))
+
+        staged = 0
+        for batch, _, _ in self.read_batches(table):
+            staged += self.copy_batch(session, staging, table, batch)
+
+        session.execute(text(f"CREATE INDEX ON {staging} ({', '.join(keys)})"))
+        session.execute(text(f"ANALYZE {staging}"))
+        return staged
+
+    def upsert_table(self, session: Session, table: str) -> tuple:
+        columns, keys = self._columns(table)
+        staging = f"delta_{table}"
+
+        def fingerprint(alias):
+            values = ", ".join(f'{alias}."{column}"' for column in columns)
+            return f"md5(ROW({values})::text)"
+
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        source_columns = ", ".join(f's."{column}"' for column in columns)
+        key_list = ", ".join(f'"{key}"' for key in keys)
+        source_keys = ", ".join(f's."{key}"' for key in keys)
+        key_join = " AND ".join(f'c."{key}" = s."{key}"' for key in keys)
+        updates = ", ".join(f'"{column}" = EXCLUDED."{column}"' for column in columns if column not in keys)
+        conditions = [f'(c."{keys[0]}" IS NULL OR {fingerprint("c")} <> {fingerprint("s")})']
+        conditions += [
+            f"EXISTS (SELECT 1 FROM {parent} p WHERE p.{column} = s.{column})"
+            for column, parent in FOREIGN_KEYS.get(table, ())
+        ]
+
+        inserted, updated = session.execute(text(f"""
+            WITH changed AS (
+                INSERT INTO {table} ({column_list})
+                SELECT DISTINCT ON ({source_keys}) {source_columns}
+                FROM {staging} s
+                LEFT JOIN {table} c ON {key_join}
+                WHERE {" AND ".join(conditions)}
+                ON CONFLICT ({key_list}) DO UPDATE SET {updates}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM changed
+        """)).one()
+        return inserted, updated
+
+    def delete_missing(self, session: Session, table: str) -> int:
+        """Remove registros ausentes do dump novo ou cujas referências deixaram de existir nele."""
+        _, keys = self._columns(table)
+        key_match = " AND ".join(f's."{key}" = t."{key}"' for key in keys)
+        conditions = [f"NOT EXISTS (SELECT 1 FROM delta_{table} s WHERE {key_match})"]
+        conditions += [
+            f"NOT EXISTS (SELECT 1 FROM delta_{parent} p WHERE p.{column} = t.{column})"
+            for column, parent in FOREIGN_KEYS.get(table, ())
+        ]
+        result = session.execute(text(f"DELETE FROM {table} t WHERE {' OR '.join(conditions)}"))
+        return result.rowcount
+
+    def run(self):
+        order = _load_order()
+        start = time.perf_counter()
+
+        with Session(engine) as session:
+            staged = {table: self.stage_table(session, table) for table in order}
+
+            for table in order:
+                inserted, updated = self.upsert_table(session, table)
+                self.changes[table] = {"inseridos": inserted, "atualizados": updated}
+
+            for table in reversed(order):
+                self.changes[table]["removidos"] = self.delete_missing(session, table)
+
+            # Linhas removidas levam as derivadas pelo ON DELETE CASCADE; as alteradas são recalculadas aqui
+            for table in DERIVED_TABLES:
+                sync_derived(session, table)
+            session.commit()
+
+        for table in order:
+            changes = self.changes[table]
+            touched = sum(changes.values())
+            share = touched / staged[table] * 100 if staged[table] else 0.0
+            details = ", ".join(f"{count} {kind}" for kind, count in changes.items())
+            print(f"[delta] {table}: {details} ({share:.2f}% de {staged[table]} registros do dump)")
+            skipped = self.skipped.get(table)
+            if skipped:
+                print(f"[delta] {table}: {sum(skipped.values())} registros inválidos ignorados")
+
+        print(f"Atualização incremental concluída em {time.perf_counter() - start:.2f}s")
+        return True
@@ -1,47 +1,151 @@
-import pandas as pd
-
-def load_tsv(filename, usecols=None):
-    print(f'Carregando {filename}...')
-    return pd.read_csv(filename, sep='\t', usecols=usecols, dtype=str, na_values=['\\N']).fillna('')
-
-def save_tsv(df, filename):
-    print(f'Salvando {filename}...')
-    df.to_csv(filename, sep='\t', index=False)
-
-# Carregar um subconjunto do title.basics
-print('Processando title.basics...')
-title_basics = load_tsv('title.basics.tsv')
-title_basics_sample = title_basics.sample(n=300, random_state=42)
-save_tsv(title_basics_sample, 'filtered_title.basics.tsv')
-
-# Obter os tconst filtrados
-title_ids = set(title_basics_sample['tconst'])
-
-def filter_by_title_id(filename, column_name):
-    print(f'Filtrando {filename}...')
-    df = load_tsv(filename)
-    filtered_df = df[df[column_name].isin(title_ids)]
-    save_tsv(filtered_df, f'filtered_{filename}')
-    return filtered_df
-
-# Filtrar e salvar os outros arquivos com base nos tconst
-print('Filtrando title.crew...')
-title_crew_filtered = filter_by_title_id('title.crew.tsv', 'tconst')
-
-print('Filtrando title.principals...')
-title_principals_filtered = filter_by_title_id('title.principals.tsv', 'tconst')
-
-print('Filtrando title.ratings...')
-title_ratings_filtered = filter_by_title_id('title.ratings.tsv', 'tconst')
-
-# Filtrar name.basics apenas com os nomes que aparecem nos arquivos processados
-print('Filtrando name.basics...')
-people_ids = set(title_crew_filtered['directors']).union(
-    set(title_crew_filtered['writers']),
-    set(title_principals_filtered['nconst'])
-)
-name_basics = load_tsv('name.basics.tsv')
-name_basics_filtered = name_basics[name_basics['nconst'].isin(people_ids)]
-save_tsv(name_basics_filtered, 'filtered_name.basics.tsv')
-
-print('Processamento concluído!')
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+from collections import deque
+from multiprocessing import Pool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from datasets.tsv_io import open_text
+
+# Conjuntos de ids usados pelos workers, definidos uma vez por processo no initializer
+_keep_ids = set()
+_key_index = 0
+_people_columns = ()
+
+
+def _init_worker(keep_ids, key_index, people_columns):
+    global _keep_ids, _key_index, _people_columns
+    _keep_ids = keep_ids
+    _key_index = key_index
+    _people_columns = people_columns
+
+
+def to_output(fields) -> str:
+    """Converte campos do dump (\\N como nulo) para o formato dos arquivos filtrados (nulo vazio)."""
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter="\t", lineterminator="\n").writerow(
+        "" if field == "\\N" else field for field in fields
+    )
+    return buffer.getvalue()
+
+
+def _filter_chunk(lines):
+    kept = []
+    people = set()
+    for line in lines:
+        fields = line.rstrip("\r\n").split("\t")
+        if fields[_key_index] not in _keep_ids:
+            continue
+        kept.append(to_output(fields))
+        for column in _people_columns:
+            if fields[column] != "\\N":
+                people.update(fields[column].split(","))
+    return kept, people
+
+
+def read_chunks(file, chunk_size):
+    while True:
+        chunk = [line for _, line in zip(range(chunk_size), file)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def reservoir_sample(filename, sample_size, seed):
+    """Amostra uniforme de sample_size linhas em uma passada, guardando só a amostra em memória."""
+    rng = random.Random(seed)
+    reservoir = []
+    with open_text(filename) as file:
+        header = file.readline()
+        for index, line in enumerate(file):
+            if index < sample_size:
+                reservoir.append((index, line))
+            else:
+                slot = rng.randrange(index + 1)
+                if slot < sample_size:
+                    reservoir[slot] = (index, line)
+    # Mantém a ordem original do arquivo na saída
+    return header, [line for _, line in sorted(reservoir)]
+
+
+def filter_file(filename, output, key_column, keep_ids, workers, chunk_size, people_columns=()):
+    """Filtra o arquivo em blocos processados em paralelo, com no máximo 2 blocos por worker em memória.
+
+    Retorna os nconst citados nas colunas people_columns das linhas mantidas.
+    """
+    print(f"Filtrando {filename}...")
+    people = set()
+    with open_text(filename) as source, open(output, "w", encoding="utf-8") as target:
+        header = source.readline().rstrip("\r\n").split("\t")
+        target.write(to_output(header))
+        initargs = (keep_ids, header.index(key_column), tuple(header.index(column) for column in people_columns))
+
+        with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+
+            def drain(limit):
+                while len(pending) > limit:
+                    kept, chunk_people = pending.popleft().get()
+                    target.writelines(kept)
+                    people.update(chunk_people)
+
+            for chunk in read_chunks(source, chunk_size):
+                pending.append(pool.apply_async(_filter_chunk, (chunk,)))
+                drain(workers * 2)
+            drain(0)
+    return people
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os arquivos filtrados a partir dos dumps completos do IMDb.")
+    parser.add_argument("--sample-size", type=int, default=300, help="Quantidade de títulos amostrados")
+    parser.add_argument("--seed", type=int, default=42, help="Semente da amostragem")
+    parser.add_argument(
+        "--input-dir", default=".", help="Diretório com os dumps (title.basics.tsv ou title.basics.tsv.gz, ...)"
+    )
+    parser.add_argument("--output-dir", default=".", help="Diretório onde os filtered_*.tsv são gravados")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos usados na filtragem")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Linhas por bloco enviado a cada worker")
+    args = parser.parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    def source(name):
+        # Os dumps compactados são lidos direto, sem descompactar em disco
+        path = os.path.join(args.input_dir, name)
+        return path if os.path.exists(path) or not os.path.exists(f"{path}.gz") else f"{path}.gz"
+
+    def target(name):
+        return os.path.join(args.output_dir, f"filtered_{name}")
+
+    print("Processando title.basics...")
+    header, sample = reservoir_sample(source("title.basics.tsv"), args.sample_size, args.seed)
+    title_ids = set()
+    with open(target("title.basics.tsv"), "w", encoding="utf-8") as output:
+        output.write(to_output(header.rstrip("\r\n").split("\t")))
+        for line in sample:
+            fields = line.rstrip("\r\n").split("\t")
+            title_ids.add(fields[0])
+            output.write(to_output(fields))
+
+    options = {"keep_ids": title_ids, "workers": args.workers, "chunk_size": args.chunk_size}
+    people_ids = filter_file(
+        source("title.crew.tsv"), target("title.crew.tsv"), "tconst", people_columns=("directors", "writers"), **options
+    )
+    people_ids |= filter_file(
+        source("title.principals.tsv"), target("title.principals.tsv"), "tconst", people_columns=("nconst",), **options
+    )
+    filter_file(source("title.ratings.tsv"), target("title.ratings.tsv"), "tconst", **options)
+
+    # name.basics apenas com as pessoas que aparecem nos arquivos filtrados
+    options["keep_ids"] = people_ids
+    filter_file(source("name.basics.tsv"), target("name.basics.tsv"), "nconst", **options)
+
+    print("Processamento concluído!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,150 +1,482 @@
+import argparse
 import csv
+import io
+import itertools
 import os
+import signal
+import time
+from collections import Counter, defaultdict
 
-from sqlmodel import Session
+from sqlalchemy import text
+from sqlmodel import Session, select
 
+from datasets.checkpoint import CheckpointStore, IngestInterrupted
+from datasets.progress import ProgressReporter
+from datasets.tsv_io import LineReader, is_compressed, read_header
 from src.app.core.db.database import engine
 from src.app.models.name_basics import NameBasics
 from src.app.models.title_basics import TitleBasics
 from src.app.models.title_crew import TitleCrew
+from src.app.models.title_crew_member import TitleCrewMember  # noqa: F401 (tabelas mantidas por sync_derived)
+from src.app.models.title_genre import TitleGenre  # noqa: F401
 from src.app.models.title_principals import TitlePrincipals
 from src.app.models.title_ratings import TitleRatings
 
+# Valores que representam ausência de dado nos TSVs (dumps do IMDb usam \N, os filtrados usam vazio)
+NULL_VALUES = ("", "\\N")
+
+# Tabelas cujos registros podem referenciar chaves inexistentes: (coluna, tabela referenciada)
+FOREIGN_KEYS = {
+    "title_ratings": [("tconst", "title_basics")],
+    "title_crew": [("tconst", "title_basics")],
+    "title_principals": [("tconst", "title_basics"), ("nconst", "name_basics")],
+}
+
+
+def _text(value):
+    return None if value in NULL_VALUES else value
+
+
+def _int(value):
+    return None if value in NULL_VALUES else int(value)
+
+
+def parse_name_basics(row: dict) -> dict:
+    return {
+        "nconst": row["nconst"],
+        "primaryName": row["primaryName"],
+        "birthYear": _int(row["birthYear"]),
+        "deathYear": _int(row["deathYear"]),
+        "primaryProfession": _text(row["primaryProfession"]),
+        "knownForTitles": _text(row["knownForTitles"]),
+    }
+
+
+def parse_title_basics(row: dict) -> dict:
+    return {
+        "tconst": row["tconst"],
+        "titleType": row["titleType"],
+        "primaryTitle": row["primaryTitle"],
+        "originalTitle": row["originalTitle"],
+        "isAdult": row["isAdult"] == "1",
+        "startYear": _int(row["startYear"]),
+        "endYear": _int(row["endYear"]),
+        "runtimeMinutes": _int(row["runtimeMinutes"]),
+        "genres": _text(row["genres"]),
+    }
+
+
+def parse_title_ratings(row: dict) -> dict:
+    return {
+        "tconst": row["tconst"],
+        "averageRating": float(row["averageRating"]),
+        "numVotes": int(row["numVotes"]),
+    }
+
+
+def parse_title_crew(row: dict) -> dict:
+    return {
+        "tconst": row["tconst"],
+        "directors": _text(row["directors"]),
+        "writers": _text(row["writers"]),
+    }
+
+
+def parse_title_principals(row: dict) -> dict:
+    return {
+        "tconst": row["tconst"],
+        "ordering": int(row["ordering"]),
+        "nconst": row["nconst"],
+        "category": row["category"],
+        "job": _text(row["job"]),
+        "characters": _text(row["characters"]),
+    }
+
+
+MODELS = {
+    "name_basics": NameBasics,
+    "title_basics": TitleBasics,
+    "title_ratings": TitleRatings,
+    "title_crew": TitleCrew,
+    "title_principals": TitlePrincipals,
+}
+
+PRIMARY_KEYS = {
+    "name_basics": "nconst",
+    "title_basics": "tconst",
+}
+
+PARSERS = {
+    "name_basics": parse_name_basics,
+    "title_basics": parse_title_basics,
+    "title_ratings": parse_title_ratings,
+    "title_crew": parse_title_crew,
+    "title_principals": parse_title_principals,
+}
+
+
+# Tabelas derivadas das colunas com listas separadas por vírgula: tabela de origem -> (tabela derivada,
+# colunas, SELECT das linhas esperadas). {condition} restringe a origem (alias t) a alguns tconsts.
+DERIVED_TABLES = {
+    "title_basics": ("title_genre", ("tconst", "genre"), """
+        SELECT DISTINCT t.tconst, lower(trim(g.genre))
+        FROM title_basics t, unnest(string_to_array(t.genres, ',')) AS g(genre)
+        WHERE trim(g.genre) <> '' {condition}
+    """),
+    "title_crew": ("title_crew_member", ("tconst", "nconst", "role"), """
+        SELECT DISTINCT t.tconst, trim(m.nconst), m.role
+        FROM title_crew t
+        CROSS JOIN LATERAL (
+            SELECT unnest(string_to_array(t.directors, ',')), 'director'
+            UNION ALL
+            SELECT unnest(string_to_array(t.writers, ',')), 'writer'
+        ) AS m(nconst, role)
+        WHERE trim(m.nconst) <> '' {condition}
+    """),
+}
+
+
+def sync_derived(session: Session, table: str, tconsts=None):
+    """Atualiza a tabela derivada de table, só para os tconsts informados ou para a tabela toda."""
+    derived, columns, expected = DERIVED_TABLES[table]
+    column_list = ", ".join(columns)
+    if tconsts is None:
+        expected = expected.format(condition="")
+        matches = " AND ".join(f"e.{column} = d.{column}" for column in columns)
+        session.execute(text(
+            f"DELETE FROM {derived} d WHERE NOT EXISTS "
+            f"(SELECT 1 FROM ({expected}) AS e({column_list}) WHERE {matches})"
+        ))
+        session.execute(text(f"INSERT INTO {derived} ({column_list}) {expected} ON CONFLICT DO NOTHING"))
+    else:
+        expected = expected.format(condition="AND t.tconst = ANY(:tconsts)")
+        session.execute(
+            text(f"INSERT INTO {derived} ({column_list}) {expected} ON CONFLICT DO NOTHING"),
+            {"tconsts": list(tconsts)},
+        )
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class CopyBuffer(io.TextIOBase):
+    """Expõe um iterador de linhas no formato texto do COPY como arquivo para o copy_expert."""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+
+        if size < 0:
+            chunk, self._buffer = self._buffer, ""
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
 
 class IMDbDataService:
-    def __init__(self, datasets: dict):
+    MODES = ("orm", "copy")
+
+    def __init__(self, datasets: dict, mode: str = "orm", batch_size: int = 10_000, limit=None, resume=False):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de carga inválido: {mode}")
         self.datasets = datasets
+        self.mode = mode
+        self.batch_size = batch_size
+        self.limit = limit
+        self.resume = resume
+        self.skipped = defaultdict(Counter)
+        self.checkpoints = CheckpointStore()
+        self.stop_requested = False
+        self._known_keys = {}
+
+    def load_csv(self, filepath, delimiter="\t", limit=None, batch_size=None, start=0, end=None):
+        """Lê o TSV sob demanda, entregando lotes de até batch_size registros.
+
+        Só o lote corrente fica em memória, e limit interrompe a leitura assim
+        que o número de registros pedido é atingido. start/end restringem a
+        leitura às linhas que começam nesse intervalo de bytes (um shard).
+        """
+        for batch, _, _ in self.iter_batches(filepath, delimiter, limit, batch_size, start, end):
+            yield batch
+
+    def iter_batches(self, filepath, delimiter="\t", limit=None, batch_size=None, start=0, end=None):
+        """Como load_csv, mas junto de cada lote entrega o offset em bytes logo após seu último registro
+        e quantos bytes do arquivo em disco já foram lidos (diferentes quando o arquivo é .gz).
+        """
+        batch_size = batch_size or self.batch_size
+        header = read_header(filepath, delimiter)
+        lines = LineReader(filepath, start, end)
+        # Os dumps oficiais (.tsv.gz) não usam aspas; os arquivos filtrados são gravados pelo csv.writer
+        quoting = csv.QUOTE_NONE if is_compressed(filepath) else csv.QUOTE_MINIMAL
+        reader = csv.DictReader(lines, fieldnames=header, delimiter=delimiter, quoting=quoting)
+        rows = itertools.islice(reader, limit or None)
+        while batch := list(itertools.islice(rows, batch_size)):
+            yield batch, lines.position, lines.progress
+
+    def read_batches(self, table: str, shard=None):
+        start, end = shard or (0, None)
+        return self.iter_batches(self.datasets[table], limit=self.limit, start=start, end=end)
+
+    def known_keys(self, session: Session, parent: str) -> set:
+        """Chaves primárias da tabela referenciada, lidas uma única vez por carga."""
+        if parent not in self._known_keys:
+            key = getattr(MODELS[parent], PRIMARY_KEYS[parent])
+            self._known_keys[parent] = set(session.scalars(select(key)))
+        return self._known_keys[parent]
+
+    def filter_orphans(self, session: Session, table: str, rows: list) -> list:
+        checks = [(column, parent, self.known_keys(session, parent)) for column, parent in FOREIGN_KEYS[table]]
+        valid = []
+        for row in rows:
+            missing = [(column, parent) for column, parent, keys in checks if row[column] not in keys]
+            if missing:
+                for column, parent in missing:
+                    self.skipped[table][f"{column} ausente em {parent}"] += 1
+                continue
+            valid.append(row)
+        return valid
+
+    def parse_rows(self, table: str, batch: list) -> list:
+        parser = PARSERS[table]
+        rows = []
+        for row in batch:
+            try:
+                rows.append(parser(row))
+            except ValueError:
+                self.skipped[table]["valor inválido"] += 1
+        return rows
+
+    def insert_rows(self, session: Session, table: str, batch: list) -> int:
+        """Insere um lote via ORM, descartando órfãos em memória."""
+        rows = self.parse_rows(table, batch)
+        if table in FOREIGN_KEYS:
+            rows = self.filter_orphans(session, table, rows)
+        session.add_all(MODELS[table](**values) for values in rows)
+        return len(rows)
+
+    def copy_batch(self, session: Session, target: str, table: str, batch: list) -> int:
+        """Envia um lote já lido do TSV da tabela para target com COPY ... FROM STDIN."""
+        columns = [column.name for column in MODELS[table].__table__.columns]
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        lines = [
+            "\t".join(_copy_value(values[column]) for column in columns) + "\n"
+            for values in self.parse_rows(table, batch)
+        ]
+        cursor = session.connection().connection.cursor()
+        cursor.copy_expert(f"COPY {target} ({column_list}) FROM STDIN", CopyBuffer(lines))
+        return len(lines)
+
+    def copy_rows(self, session: Session, table: str, batch: list) -> int:
+        """Carrega um lote com COPY ... FROM STDIN.
+
+        Tabelas com chaves estrangeiras passam por uma tabela temporária; os órfãos
+        são contados e descartados por anti-join antes da inserção na tabela final.
+        """
+        if table not in FOREIGN_KEYS:
+            return self.copy_batch(session, table, table, batch)
+
+        column_list = ", ".join(f'"{column.name}"' for column in MODELS[table].__table__.columns)
+        target = f"stage_{table}"
+        session.execute(text(f"CREATE TEMP TABLE {target} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"))
+        self.copy_batch(session, target, table, batch)
+
+        references = [
+            (column, parent, f"EXISTS (SELECT 1 FROM {parent} p WHERE p.{column} = s.{column})")
+            for column, parent in FOREIGN_KEYS[table]
+        ]
+        missing_counts = session.execute(text(
+            "SELECT "
+            + ", ".join(f"count(*) FILTER (WHERE NOT {exists})" for _, _, exists in references)
+            + f" FROM {target} s"
+        )).one()
+        for (column, parent, _), missing in zip(references, missing_counts):
+            if missing:
+                self.skipped[table][f"{column} ausente em {parent}"] += missing
+
+        conditions = " AND ".join(exists for _, _, exists in references)
+        result = session.execute(text(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {target} s WHERE {conditions}"
+        ))
+        return result.rowcount
+
+    def request_stop(self, *_):
+        print("Interrupção solicitada; a carga para após o lote atual.")
+        self.stop_requested = True
+
+    def populate(self, session: Session, table: str, shard=None) -> int:
+        """Carrega a tabela (ou uma fatia dela) lote a lote, com um commit e um checkpoint por lote.
+
+        Com resume, a leitura recomeça no offset salvo para a fatia e fatias já
+        concluídas são puladas.
+        """
+        filepath = self.datasets[table]
+        start, end = shard or (0, None)
+        stop = end if end is not None else os.path.getsize(filepath)
+        position, inserted = start, 0
+
+        if self.resume:
+            saved = self.checkpoints.load(session, table, filepath, start, stop)
+            if saved:
+                position, inserted, done = saved
+                if done:
+                    print(f"[{self.mode}] {table}: fatia em {start} já concluída, pulando.")
+                    return inserted
+                print(f"[{self.mode}] {table}: retomando do byte {position} ({inserted} registros já carregados)")
+        else:
+            self.checkpoints.ensure(session)
+
+        if self.mode == "copy":
+            write_batch = self.copy_rows
+        else:
+            write_batch = self.insert_rows
+            self._known_keys.pop(table, None)
+
+        if self.stop_requested:
+            raise IngestInterrupted(f"{table}: interrompida antes de começar")
+
+        label = table if shard is None else f"{table}[{start}:{stop}]"
+        # Em arquivos .gz o checkpoint conta bytes descompactados e o progresso, bytes do arquivo em disco
+        progress = ProgressReporter(label, start, stop, None if is_compressed(filepath) else position)
+
+        for batch, position, read in self.read_batches(table, (position, end)):
+            written = write_batch(session, table, batch)
+            inserted += written
+            if table in DERIVED_TABLES:
+                session.flush()
+                sync_derived(session, table, [row["tconst"] for row in batch])
+            self.checkpoints.save(session, table, filepath, start, stop, position, inserted)
+            session.commit()
+            progress.update(written, read)
+            if self.stop_requested:
+                raise IngestInterrupted(f"{table}: interrompida no byte {position}")
 
-    def load_csv(self, filepath, delimiter="\t", limit=None):
-        with open(filepath, encoding="utf-8") as file:
-            reader = csv.DictReader(file, delimiter=delimiter)
-            data = list(reader)
-            return data[:limit] if limit else data
-
-    def populate_name_basics(self, session: Session):
-        data = self.load_csv(self.datasets["name_basics"])
-
-        for row in data:
-            name_basic = NameBasics(
-                nconst=row["nconst"],
-                primaryName=row["primaryName"],
-                birthYear=int(row["birthYear"]) if row["birthYear"] else None,
-                deathYear=int(row["deathYear"]) if row["deathYear"] else None,
-                primaryProfession=row["primaryProfession"] if row["primaryProfession"] else None,
-                knownForTitles=row["knownForTitles"] if row["knownForTitles"] else None,
-            )
-            session.add(name_basic)
-        print("Dados de nomes inseridos em name_basics.")
-        session.commit() 
-
-
-    def populate_title_basics(self, session: Session):
-        data = self.load_csv(self.datasets["title_basics"])
-
-        for row in data:
-            title = TitleBasics(
-                tconst=row["tconst"],
-                titleType=row["titleType"],
-                primaryTitle=row["primaryTitle"],
-                originalTitle=row["originalTitle"],
-                isAdult=row["isAdult"] == "1",
-                startYear=int(row["startYear"]) if row["startYear"] else None,
-                endYear=int(row["endYear"]) if row["endYear"] else None,
-                runtimeMinutes=int(row["runtimeMinutes"]) if row["runtimeMinutes"] else None,
-                genres=row["genres"] if row["genres"] else None
-            )
-            session.add(title)
-        print("Títulos inseridos em title_basics.")
-        session.commit()  
-
-
-    def populate_title_ratings(self, session: Session):
-        data = self.load_csv(self.datasets["title_ratings"])
-
-        for row in data:
-            rating = TitleRatings(
-                tconst=row["tconst"],
-                averageRating=float(row["averageRating"]),
-                numVotes=int(row["numVotes"])
-            )
-            session.add(rating)
-        print("Avaliações inseridas em title_ratings.")
-        session.commit()  
-
-
-    def populate_title_crew(self, session: Session):
-        data = self.load_csv(self.datasets["title_crew"])
-
-        for row in data:
-            tconst = row["tconst"]
-            existing_title = session.query(TitleBasics).filter(TitleBasics.tconst == tconst).first()
-
-            if existing_title:  
-                crew = TitleCrew(
-                    tconst=tconst,
-                    directors=row["directors"] if row["directors"] else None,
-                    writers=row["writers"] if row["writers"] else None
-                )
-                session.add(crew)
-            else:
-                print(f"Registro com tconst {tconst} não encontrado em title_basics. Ignorando.")
-        print("Diretores e roteiristas inseridos em title_crew.")
-        session.commit() 
-
-
-    def populate_title_principals(self, session: Session):
-        data = self.load_csv(self.datasets["title_principals"])
-
-        for row in data:
-            tconst = row["tconst"]
-            nconst = row["nconst"]
-
-            existing_title = session.query(TitleBasics).filter(TitleBasics.tconst == tconst).first()
-            existing_name = session.query(NameBasics).filter(NameBasics.nconst == nconst).first()
-
-            if existing_title and existing_name:  
-                try:
-                    ordering = int(row["ordering"])
-                except ValueError:
-                    print(f"Valor inválido para 'ordering' em tconst {tconst}, nconst {nconst}. Ignorando registro.")
-                    continue  
-
-                principal = TitlePrincipals(
-                    tconst=tconst,
-                    ordering=ordering,
-                    nconst=nconst,
-                    category=row["category"],
-                    job=row["job"] if row["job"] else None,
-                    characters=row["characters"] if row["characters"] else None
-                )
-                session.add(principal)
-
-            else:
-                if not existing_title:
-                    print(f"Registro com tconst {tconst} não encontrado em title_basics. Ignorando.")
-                if not existing_name:
-                    print(f"Registro com nconst {nconst} não encontrado em name_basics. Ignorando.")
-
-        print("Profissionais inseridos em title_principals.")
-        session.commit() 
+        self.checkpoints.save(session, table, filepath, start, stop, position, inserted, done=True)
+        session.commit()
+        return inserted
 
+    def populate_name_basics(self, session: Session) -> int:
+        return self.populate(session, "name_basics")
 
+    def populate_title_basics(self, session: Session) -> int:
+        return self.populate(session, "title_basics")
+
+    def populate_title_ratings(self, session: Session) -> int:
+        return self.populate(session, "title_ratings")
+
+    def populate_title_crew(self, session: Session) -> int:
+        return self.populate(session, "title_crew")
+
+    def populate_title_principals(self, session: Session) -> int:
+        return self.populate(session, "title_principals")
+
+    def report(self, table: str, rows: int, elapsed: float):
+        rate = rows / elapsed if elapsed > 0 else float("inf")
+        print(f"[{self.mode}] {table}: {rows} registros em {elapsed:.2f}s ({rate:.0f} registros/s)")
+        skipped = self.skipped.get(table)
+        if skipped:
+            details = ", ".join(f"{reason}: {count}" for reason, count in skipped.most_common())
+            print(f"[{self.mode}] {table}: {sum(skipped.values())} ocorrências ignoradas ({details})")
 
     def run(self):
+        steps = [
+            ("name_basics", self.populate_name_basics),
+            ("title_basics", self.populate_title_basics),
+            ("title_ratings", self.populate_title_ratings),
+            ("title_crew", self.populate_title_crew),
+            ("title_principals", self.populate_title_principals),
+        ]
+
+        signal.signal(signal.SIGINT, self.request_stop)
+
         with Session(engine) as session:
-            self.populate_name_basics(session)
-            self.populate_title_basics(session)
-            self.populate_title_ratings(session)
-            self.populate_title_crew(session)
-            self.populate_title_principals(session)
-            session.commit()
+            if not self.resume:
+                self.checkpoints.clear(session)
+            try:
+                for table, populate in steps:
+                    start = time.perf_counter()
+                    rows = populate(session)
+                    self.report(table, rows, time.perf_counter() - start)
+            except IngestInterrupted as interrupted:
+                print(f"Carga interrompida ({interrupted}). Execute novamente com --resume para continuar.")
+                return False
 
         print("Banco populado com sucesso!")
+        return True
 
 
 if __name__ == "__main__":
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+    parser = argparse.ArgumentParser(description="Popula o banco com os datasets do IMDb.")
+    parser.add_argument(
+        "--mode",
+        choices=IMDbDataService.MODES,
+        default="orm",
+        help="orm: insere via SQLModel (padrão); copy: carga em massa com COPY ... FROM STDIN",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Registros por lote (um commit por lote)")
+    parser.add_argument("--limit", type=int, default=None, help="Máximo de registros lidos de cada arquivo")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Carrega as tabelas em paralelo com N processos, respeitando as dependências entre elas",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=64,
+        help="Tamanho (MB) de cada fatia de arquivo carregada em paralelo com --workers",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma uma carga interrompida a partir dos checkpoints salvos no banco",
+    )
+    parser.add_argument(
+        "--defer-constraints",
+        action="store_true",
+        help="Remove FKs e índices secundários antes da carga e os recria em paralelo ao final",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Aplica só as diferenças entre os dumps e o banco (inserções, atualizações e remoções)",
+    )
+    args = parser.parse_args()
+    if args.workers and args.limit:
+        parser.error("--limit não é suportado com --workers")
+    if args.delta and (args.workers or args.limit or args.resume or args.defer_constraints):
+        parser.error("--delta compara o dump inteiro e não aceita --workers, --limit, --resume nem --defer-constraints")
+
+    deferred = None
+    if args.defer_constraints:
+        from datasets.deferred_constraints import DeferredConstraints
+
+        deferred = DeferredConstraints(workers=args.workers or 4)
+        deferred.drop()
+
     datasets = {
         "title_basics": os.path.join(BASE_DIR, "./filtrados/filtered_title.basics.tsv"),
         "title_ratings": os.path.join(BASE_DIR, "./filtrados/filtered_title.ratings.tsv"),
@@ -153,5 +485,35 @@ if __name__ == "__main__":
         "name_basics": os.path.join(BASE_DIR, "./filtrados/filtered_name.basics.tsv")
     }
 
-    service = IMDbDataService(datasets)
-    service.run()
\ No newline at end of file
+    if args.delta:
+        from datasets.delta_ingest import DeltaIngestService
+
+        completed = DeltaIngestService(datasets, batch_size=args.batch_size).run()
+    elif args.workers:
+        from datasets.parallel_loader import ParallelIMDbLoader
+
+        loader = ParallelIMDbLoader(
+            datasets,
+            mode=args.mode,
+            workers=args.workers,
+            shard_size=args.shard_size * 1024 * 1024,
+            batch_size=args.batch_size,
+            resume=args.resume,
+        )
+        completed = loader.run()
+    else:
+        service = IMDbDataService(
+            datasets, mode=args.mode, batch_size=args.batch_size, limit=args.limit, resume=args.resume
+        )
+        completed = service.run()
+
+    if deferred and completed:
+        deferred.restore()
+    elif deferred:
+        print("Restrições continuam removidas; serão recriadas ao final da carga retomada com --resume.")
+
+    if completed:
+        from src.app.core.db.rating_stats import refresh_rating_stats
+
+        if refresh_rating_stats():
+            print("Estatísticas de avaliação (rating_stats) atualizadas.")
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from datasets.imdb_data_service import MODELS, IMDbDataService
+from datasets.synthetic_generator import SyntheticIMDbGenerator
+from src.app.core.db.database import engine
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+STEPS = ["name_basics", "title_basics", "title_ratings", "title_crew", "title_principals"]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def synthetic_datasets(titles: int, seed: int, data_dir: str) -> dict:
+    """Gera (ou reaproveita) os TSVs sintéticos da escala pedida."""
+    output_dir = os.path.join(data_dir, f"{titles}-{seed}")
+    paths = {
+        table: os.path.join(output_dir, f"{table.replace('_', '.', 1)}.tsv")
+        for table in STEPS
+    }
+    if not all(os.path.exists(path) for path in paths.values()):
+        print(f"Gerando dados sintéticos com {titles} títulos em {output_dir}...")
+        paths = SyntheticIMDbGenerator(titles, seed=seed).generate(output_dir)
+    return paths
+
+
+def row_counts(session: Session) -> dict:
+    return {table: session.execute(text(f"SELECT count(*) FROM {table}")).scalar_one() for table in MODELS}
+
+
+def truncate(session: Session):
+    session.execute(text(f"TRUNCATE {', '.join(MODELS)} CASCADE"))
+    session.commit()
+
+
+def run_once(datasets: dict, mode: str, batch_size: int) -> dict:
+    service = IMDbDataService(datasets, mode=mode, batch_size=batch_size)
+    steps = {}
+    with Session(engine) as session:
+        service.checkpoints.clear(session)
+        for table in STEPS:
+            started = time.perf_counter()
+            rows = getattr(service, f"populate_{table}")(session)
+            elapsed = time.perf_counter() - started
+            steps[table] = {"rows": rows, "seconds": round(elapsed, 3), "rows_per_second": round(rows / elapsed, 1)}
+    return steps
+
+
+def baseline(results_path: str, key: dict) -> dict:
+    """Mediana do tempo de cada etapa nas execuções anteriores com a mesma escala, modo e lote."""
+    if not os.path.exists(results_path):
+        return {}
+    timings = {}
+    with open(results_path, encoding="utf-8") as file:
+        for line in file:
+            result = json.loads(line)
+            if any(result.get(field) != value for field, value in key.items()):
+                continue
+            for table, step in result["steps"].items():
+                timings.setdefault(table, []).append(step["seconds"])
+    return {table: statistics.median(values) for table, values in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede o tempo de cada etapa populate_* sobre dados sintéticos e detecta regressões."
+    )
+    parser.add_argument("--titles", type=int, default=10_000, help="Escala dos dados sintéticos (quantidade de títulos)")
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos dados sintéticos")
+    parser.add_argument("--mode", choices=IMDbDataService.MODES, default="copy", help="Modo de carga medido")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Registros por lote")
+    parser.add_argument("--repeat", type=int, default=1, help="Quantidade de execuções (cada uma limpa as tabelas)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Razão sobre a mediana anterior a partir da qual uma etapa é considerada regressão",
+    )
+    parser.add_argument("--data-dir", default=os.path.join(BASE_DIR, "sinteticos"), help="Onde os TSVs são gerados")
+    parser.add_argument(
+        "--results", default=os.path.join(BASE_DIR, "benchmark_results.jsonl"), help="Arquivo JSON lines de resultados"
+    )
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Apaga os dados que já estiverem nas tabelas do IMDb antes da primeira execução",
+    )
+    args = parser.parse_args()
+
+    datasets = synthetic_datasets(args.titles, args.seed, args.data_dir)
+    key = {"titles": args.titles, "seed": args.seed, "mode": args.mode, "batch_size": args.batch_size}
+    previous = baseline(args.results, key)
+    regressions = []
+
+    with Session(engine) as session:
+        if any(row_counts(session).values()):
+            if not args.truncate:
+                parser.error("as tabelas já têm dados; use --truncate para apagá-los antes do benchmark")
+            truncate(session)
+
+    for attempt in range(1, args.repeat + 1):
+        if attempt > 1:
+            # Os dados agora são da execução anterior do próprio benchmark
+            with Session(engine) as session:
+                truncate(session)
+
+        print(f"Execução {attempt}/{args.repeat} ({args.mode}, {args.titles} títulos)...")
+        steps = run_once(datasets, args.mode, args.batch_size)
+        result = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            **key,
+            "steps": steps,
+            "total_seconds": round(sum(step["seconds"] for step in steps.values()), 3),
+        }
+        with open(args.results, "a", encoding="utf-8") as file:
+            file.write(json.dumps(result) + "\n")
+
+        for table, step in steps.items():
+            reference = previous.get(table)
+            if reference and step["seconds"] > reference * args.threshold:
+                regressions.append(table)
+                flag = "  <-- REGRESSÃO"
+            else:
+                flag = ""
+            comparison = f" (mediana anterior {reference:.3f}s)" if reference else ""
+            print(f"  {table}: {step['rows']} registros em {step['seconds']:.3f}s{comparison}{flag}")
+
+    if regressions:
+        print(f"Regressões detectadas em: {', '.join(sorted(set(regressions)))}")
+        raise SystemExit(1)
+    print(f"Resultados gravados em {args.results}")
+
+
+if __name__ == "__main__":
+    main()
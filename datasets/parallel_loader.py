@@ -0,0 +1,124 @@
+import os
+import signal
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from sqlmodel import Session
+
+from datasets.checkpoint import IngestInterrupted
+from datasets.imdb_data_service import FOREIGN_KEYS, MODELS, IMDbDataService
+from datasets.tsv_io import shard_ranges
+from src.app.core.db.database import engine
+
+# Cada tabela depende das tabelas que suas chaves estrangeiras referenciam
+DEPENDENCIES = {
+    table: tuple(parent for _, parent in FOREIGN_KEYS.get(table, ()))
+    for table in MODELS
+}
+
+_worker_service = None
+
+
+def _init_worker(datasets: dict, mode: str, batch_size: int, resume: bool):
+    global _worker_service
+    # Conexões herdadas do processo pai não podem ser reutilizadas após o fork
+    engine.dispose(close=False)
+    _worker_service = IMDbDataService(datasets, mode=mode, batch_size=batch_size, resume=resume)
+    signal.signal(signal.SIGINT, _worker_service.request_stop)
+
+
+def _load_shard(table: str, shard: tuple):
+    with Session(engine) as session:
+        rows = _worker_service.populate(session, table, shard)
+    skipped = _worker_service.skipped.pop(table, Counter())
+    return rows, skipped
+
+
+class ParallelIMDbLoader:
+    """Carrega as tabelas em um pool de processos respeitando as dependências entre elas.
+
+    Uma tabela só começa depois que todas as tabelas que ela referencia terminaram,
+    e arquivos maiores que shard_size são divididos em intervalos de bytes
+    carregados em paralelo.
+    """
+
+    def __init__(
+        self,
+        datasets: dict,
+        mode: str = "copy",
+        workers: int | None = None,
+        shard_size: int = 64 * 1024 * 1024,
+        batch_size: int = 10_000,
+        resume: bool = False,
+    ):
+        self.datasets = datasets
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+        self.resume = resume
+        # Usado para os checkpoints e o relatório de cada tabela; a carga acontece nos workers
+        self.service = IMDbDataService(datasets, mode=mode, batch_size=batch_size, resume=resume)
+
+    def run(self):
+        started = {}
+        remaining = {}
+        rows = Counter()
+        completed = set()
+        running = {}
+
+        interrupted = None
+
+        def submit_ready():
+            if interrupted or self.service.stop_requested:
+                return
+            for table, parents in DEPENDENCIES.items():
+                if table in started or not all(parent in completed for parent in parents):
+                    continue
+                shards = shard_ranges(self.datasets[table], self.shard_size)
+                started[table] = time.perf_counter()
+                remaining[table] = len(shards)
+                for shard in shards:
+                    running[pool.submit(_load_shard, table, shard)] = table
+
+        with Session(engine) as session:
+            if self.resume:
+                self.service.checkpoints.ensure(session)
+            else:
+                self.service.checkpoints.clear(session)
+        engine.dispose()
+
+        signal.signal(signal.SIGINT, self.service.request_stop)
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.datasets, self.mode, self.batch_size, self.resume),
+        ) as pool:
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table = running.pop(future)
+                    if future.cancelled():
+                        continue
+                    try:
+                        shard_rows, skipped = future.result()
+                    except IngestInterrupted as error:
+                        interrupted = error
+                        for pending in running:
+                            pending.cancel()
+                        continue
+                    rows[table] += shard_rows
+                    self.service.skipped[table].update(skipped)
+                    remaining[table] -= 1
+                    if remaining[table] == 0:
+                        completed.add(table)
+                        self.service.report(table, rows[table], time.perf_counter() - started[table])
+                submit_ready()
+
+        if interrupted or self.service.stop_requested:
+            print("Carga interrompida. Execute novamente com --resume para continuar.")
+            return False
+        print("Banco populado com sucesso!")
+        return True
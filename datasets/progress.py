@@ -0,0 +1,60 @@
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def memory_usage_mb() -> float:
+    """Memória residente atual do processo, ou o pico quando /proc não está disponível."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class ProgressReporter:
+    """Imprime periodicamente registros/s, percentual lido, ETA e memória de uma carga."""
+
+    def __init__(self, label: str, start: int, end: int, position: int | None = None, interval: float = 10.0):
+        self.label = label
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.rows = 0
+        # Ao retomar, a taxa e o ETA consideram só os bytes lidos nesta execução
+        self.resumed_at = self.position = start if position is None else position
+        self.started = time.perf_counter()
+        self.last_report = self.started
+
+    def update(self, rows: int, position: int):
+        self.rows += rows
+        self.position = position
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now: float | None = None):
+        elapsed = (now or time.perf_counter()) - self.started
+        total = max(self.end - self.start, 1)
+        done = self.position - self.start
+        read = self.position - self.resumed_at
+        rate = self.rows / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / (read / elapsed) if read and elapsed > 0 else None
+        print(
+            f"[progresso] {self.label}: {self.rows} registros, {done / total:.1%} do arquivo, "
+            f"{rate:.0f} registros/s, ETA {_duration(eta) if eta is not None else '?'}, "
+            f"memória {memory_usage_mb():.0f} MB"
+        )
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import create_engine, select
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session
+
+from src.app.core.db.rows import as_dicts, select_columns
+from src.app.dtos.PaginationResultDto import PaginationResultDto
+from src.app.dtos.TitleBasicsDto import TitleBasicsDto
+from src.app.models.name_basics import NameBasics  # noqa: F401 (os relacionamentos de TitleBasics precisam de todos os modelos)
+from src.app.models.title_basics import TitleBasics
+from src.app.models.title_crew import TitleCrew  # noqa: F401
+from src.app.models.title_principals import TitlePrincipals  # noqa: F401
+from src.app.models.title_ratings import TitleRatings  # noqa: F401
+
+TITLE_TYPES = ["movie", "short", "tvSeries", "tvEpisode", "video"]
+GENRES = ["Drama", "Comedy", "Documentary", "Action", "Romance", "Thriller", "Horror"]
+
+
+def create_database(rows: int, seed: int):
+    """SQLite em memória só com title_basics: o benchmark mede a serialização, não o Postgres."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    TitleBasics.__table__.create(engine)
+    rng = random.Random(seed)
+    titles = []
+    for index in range(rows):
+        start_year = rng.randint(1900, 2024)
+        titles.append({
+            "tconst": f"tt{index:08d}",
+            "titleType": rng.choice(TITLE_TYPES),
+            "primaryTitle": f"Título {index}",
+            "originalTitle": f"Original title {index}",
+            "isAdult": rng.random() < 0.02,
+            "startYear": start_year,
+            "endYear": start_year + rng.randint(0, 10) if rng.random() < 0.1 else None,
+            "runtimeMinutes": rng.randint(5, 200),
+            "genres": ",".join(rng.sample(GENRES, rng.randint(1, 3))),
+        })
+    with engine.begin() as conn:
+        conn.execute(TitleBasics.__table__.insert(), titles)
+    return engine
+
+
+def create_app(engine) -> FastAPI:
+    app = FastAPI()
+    # As duas rotas passam pela validação do response_model, que o FastAPI refaz em toda
+    # resposta mesmo com ORJSONResponse: o ganho vem de não montar objetos ORM e do encoder
+
+    def page(dto_class, data, limit):
+        return dto_class(page=1, limit=limit, total_items=len(data), number_of_pages=1, data=data)
+
+    # Antes: objetos ORM, data sem tipo e o encoder JSON padrão
+    @app.get("/before", response_model=PaginationResultDto, response_class=JSONResponse)
+    async def before(limit: int = Query(...)):
+        with Session(engine) as db:
+            data = db.scalars(select(TitleBasics).order_by(TitleBasics.tconst).limit(limit)).all()
+            return page(PaginationResultDto, data, limit)
+
+    # Depois: colunas sem objetos ORM, DTOs tipados e orjson
+    @app.get("/after", response_model=PaginationResultDto[TitleBasicsDto], response_class=ORJSONResponse)
+    async def after(limit: int = Query(...)):
+        with Session(engine) as db:
+            data = as_dicts(db.execute(select_columns(TitleBasics).order_by(TitleBasics.tconst).limit(limit)))
+            return page(PaginationResultDto[TitleBasicsDto], data, limit)
+
+    return app
+
+
+async def request(app: FastAPI, path: str, query: str) -> bytes:
+    """Chama a aplicação direto pela interface ASGI, sem servidor nem cliente HTTP."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [],
+        "client": ("benchmark", 0),
+        "server": ("benchmark", 80),
+    }
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"{path} respondeu {message['status']}")
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return bytes(body)
+
+
+async def measure(app: FastAPI, path: str, limit: int, repeat: int) -> float:
+    """Mediana, em segundos, de repeat requisições de uma página com limit itens."""
+    query = f"limit={limit}"
+    for _ in range(max(1, repeat // 10)):
+        await request(app, path, query)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await request(app, path, query)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def run(args):
+    engine = create_database(max(args.limits), args.seed)
+    app = create_app(engine)
+
+    for limit in args.limits:
+        # As duas rotas precisam devolver o mesmo conteúdo para a comparação valer
+        query = f"limit={limit}"
+        if json.loads(await request(app, "/before", query)) != json.loads(await request(app, "/after", query)):
+            raise SystemExit(f"As respostas de /before e /after diferem com limit={limit}")
+
+    print(f"{'itens':>6} {'antes (µs/item)':>16} {'depois (µs/item)':>17} {'ganho':>7}")
+    for limit in args.limits:
+        before = await measure(app, "/before", limit, args.repeat)
+        after = await measure(app, "/after", limit, args.repeat)
+        print(f"{limit:>6} {before / limit * 1e6:>16.2f} {after / limit * 1e6:>17.2f} {before / after:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara o custo por item de serializar uma página de títulos antes e depois dos DTOs tipados."
+    )
+    parser.add_argument("--limits", type=int, nargs="+", default=[10, 100, 1000], help="Tamanhos de página medidos")
+    parser.add_argument("--repeat", type=int, default=200, help="Requisições medidas por rota e tamanho")
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos dados sintéticos")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import argparse
+import os
+import random
+
+TITLE_TYPES = {
+    "tvEpisode": 0.70,
+    "short": 0.09,
+    "movie": 0.07,
+    "video": 0.03,
+    "tvSeries": 0.03,
+    "tvMovie": 0.015,
+    "tvMiniSeries": 0.005,
+    "tvSpecial": 0.004,
+    "videoGame": 0.004,
+    "tvShort": 0.002,
+}
+
+# Mais comuns primeiro; o peso de cada gênero cai com a posição (distribuição tipo Zipf)
+GENRES = [
+    "Drama", "Comedy", "Documentary", "Talk-Show", "Reality-TV", "Romance", "Family", "News", "Animation",
+    "Crime", "Action", "Adventure", "Music", "Game-Show", "Thriller", "Horror", "Mystery", "Fantasy",
+    "Sport", "Biography", "History", "Sci-Fi", "Short", "Adult", "Musical", "War", "Western", "Film-Noir",
+]
+GENRE_WEIGHTS = [1 / (rank + 1) for rank in range(len(GENRES))]
+
+CATEGORIES = {
+    "actor": 0.30,
+    "actress": 0.22,
+    "self": 0.15,
+    "director": 0.08,
+    "writer": 0.08,
+    "producer": 0.07,
+    "composer": 0.04,
+    "cinematographer": 0.03,
+    "editor": 0.02,
+    "production_designer": 0.01,
+}
+
+PROFESSIONS = [
+    "actor", "actress", "director", "writer", "producer", "composer", "cinematographer", "editor",
+    "soundtrack", "camera_department", "art_department", "miscellaneous",
+]
+
+WORDS = [
+    "Night", "Day", "Love", "War", "City", "Dream", "Last", "Secret", "House", "Road", "Star", "Blood",
+    "Shadow", "River", "King", "Queen", "Game", "World", "Heart", "Fire", "Ghost", "Summer", "Winter",
+    "Story", "Island", "Dark", "Golden", "Lost", "Silent", "Wild", "Broken", "Return", "Legend", "Storm",
+]
+ACCENTED_WORDS = ["Coração", "Canção", "Mañana", "Été", "Rêve", "Über", "Señor", "Ação", "Noël", "Fôlego"]
+
+FIRST_NAMES = [
+    "Ana", "João", "Maria", "José", "Lucas", "Julia", "Pedro", "Laura", "Carlos", "Sofia", "John", "Mary",
+    "James", "Linda", "Robert", "Akira", "Mei", "Hans", "Ingrid", "Pierre", "Amélie", "Diego", "Lucía",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Smith", "Johnson", "Brown", "Müller", "Schmidt", "García",
+    "Martínez", "Rossi", "Dubois", "Tanaka", "Suzuki", "Kim", "Lee", "Novak", "Kowalski", "Andersson",
+]
+
+NULL = "\\N"
+
+
+def tconst(index: int) -> str:
+    return f"tt{index + 1:07d}"
+
+
+def nconst(index: int) -> str:
+    return f"nm{index + 1:07d}"
+
+
+class SyntheticIMDbGenerator:
+    """Gera os cinco TSVs do IMDb com referências consistentes e distribuições próximas das reais.
+
+    Os arquivos saem no formato dos dumps oficiais (\\N como nulo, sem aspas) e são
+    escritos em streaming: a memória usada não depende da escala. Toda pessoa
+    referenciada em crew/principals existe em name.basics, e a popularidade das
+    pessoas é enviesada para que algumas apareçam em muitos títulos.
+    """
+
+    def __init__(self, titles: int, seed: int = 42, names_per_title: float = 1.4, rated_share: float = 0.3):
+        self.titles = titles
+        self.names = max(1, int(titles * names_per_title))
+        self.rated_share = rated_share
+        self.random = random.Random(seed)
+
+    def person(self) -> int:
+        # Cubo de um uniforme: poucos índices baixos concentram a maior parte das participações
+        return int(self.names * self.random.random() ** 3)
+
+    def text(self) -> str:
+        words = self.random.choices(WORDS, k=self.random.randint(1, 4))
+        if self.random.random() < 0.1:
+            words.append(self.random.choice(ACCENTED_WORDS))
+        return " ".join(words)
+
+    def title_row(self, index: int) -> list:
+        rng = self.random
+        title_type = rng.choices(list(TITLE_TYPES), weights=list(TITLE_TYPES.values()))[0]
+        primary_title = self.text()
+        original_title = primary_title if rng.random() < 0.85 else self.text()
+        start_year = 1890 + int(135 * rng.betavariate(5, 1.5)) if rng.random() < 0.9 else None
+        end_year = None
+        if title_type in ("tvSeries", "tvMiniSeries") and start_year and rng.random() < 0.6:
+            end_year = min(2025, start_year + rng.randint(0, 15))
+        runtime = None
+        if rng.random() < 0.65:
+            median = 90 if title_type in ("movie", "tvMovie") else 10 if title_type == "short" else 30
+            runtime = max(1, int(rng.lognormvariate(0, 0.4) * median))
+        genres = sorted(set(rng.choices(GENRES, weights=GENRE_WEIGHTS, k=rng.randint(1, 3))))
+        return [
+            tconst(index),
+            title_type,
+            primary_title,
+            original_title,
+            "1" if rng.random() < 0.02 else "0",
+            str(start_year) if start_year else NULL,
+            str(end_year) if end_year else NULL,
+            str(runtime) if runtime else NULL,
+            ",".join(genres) if rng.random() < 0.95 else NULL,
+        ]
+
+    def rating_row(self, index: int) -> list:
+        rating = min(10.0, max(1.0, self.random.gauss(6.8, 1.3)))
+        votes = min(3_000_000, int(5 * self.random.paretovariate(1.1)))
+        return [tconst(index), f"{rating:.1f}", str(votes)]
+
+    def crew_row(self, index: int) -> list:
+        rng = self.random
+        directors = sorted({nconst(self.person()) for _ in range(rng.choices([0, 1, 2, 3], [0.1, 0.75, 0.1, 0.05])[0])})
+        writers = sorted({nconst(self.person()) for _ in range(rng.choices([0, 1, 2, 4], [0.4, 0.35, 0.15, 0.1])[0])})
+        return [tconst(index), ",".join(directors) or NULL, ",".join(writers) or NULL]
+
+    def principal_rows(self, index: int) -> list:
+        rng = self.random
+        rows = []
+        for ordering in range(1, rng.randint(1, 10) + 1):
+            category = rng.choices(list(CATEGORIES), weights=list(CATEGORIES.values()))[0]
+            characters = f'["{rng.choice(FIRST_NAMES)}"]' if category in ("actor", "actress", "self") else NULL
+            job = NULL if category in ("actor", "actress", "self") or rng.random() < 0.7 else category
+            rows.append([tconst(index), str(ordering), nconst(self.person()), category, job, characters])
+        return rows
+
+    def name_row(self, index: int) -> list:
+        rng = self.random
+        birth_year = rng.randint(1850, 2010) if rng.random() < 0.35 else None
+        death_year = birth_year + rng.randint(20, 95) if birth_year and rng.random() < 0.3 else None
+        professions = sorted(set(rng.choices(PROFESSIONS, k=rng.randint(1, 3))))
+        known_for = sorted({tconst(rng.randrange(self.titles)) for _ in range(rng.randint(0, 4))})
+        return [
+            nconst(index),
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            str(birth_year) if birth_year else NULL,
+            str(death_year) if death_year and death_year <= 2025 else NULL,
+            ",".join(professions),
+            ",".join(known_for) or NULL,
+        ]
+
+    def generate(self, output_dir: str) -> dict:
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {
+            table: os.path.join(output_dir, f"{table.replace('_', '.', 1)}.tsv")
+            for table in ("title_basics", "title_ratings", "title_crew", "title_principals", "name_basics")
+        }
+        headers = {
+            "title_basics": "tconst titleType primaryTitle originalTitle isAdult startYear endYear runtimeMinutes genres",
+            "title_ratings": "tconst averageRating numVotes",
+            "title_crew": "tconst directors writers",
+            "title_principals": "tconst ordering nconst category job characters",
+            "name_basics": "nconst primaryName birthYear deathYear primaryProfession knownForTitles",
+        }
+        files = {table: open(path, "w", encoding="utf-8") for table, path in paths.items()}
+        try:
+            for table, file in files.items():
+                file.write(headers[table].replace(" ", "\t") + "\n")
+
+            def write(table, row):
+                files[table].write("\t".join(row) + "\n")
+
+            for index in range(self.titles):
+                write("title_basics", self.title_row(index))
+                if self.random.random() < self.rated_share:
+                    write("title_ratings", self.rating_row(index))
+                write("title_crew", self.crew_row(index))
+                for row in self.principal_rows(index):
+                    write("title_principals", row)
+
+            for index in range(self.names):
+                write("name_basics", self.name_row(index))
+        finally:
+            for file in files.values():
+                file.close()
+
+        return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera dumps sintéticos do IMDb em qualquer escala.")
+    parser.add_argument("--titles", type=int, default=1_000, help="Quantidade de títulos (ex.: 1000 a 10000000)")
+    parser.add_argument("--seed", type=int, default=42, help="Semente para gerar sempre os mesmos dados")
+    parser.add_argument("--names-per-title", type=float, default=1.4, help="Pessoas geradas por título")
+    parser.add_argument("--output-dir", default=os.path.join("datasets", "sinteticos"), help="Diretório de saída")
+    args = parser.parse_args()
+
+    generator = SyntheticIMDbGenerator(args.titles, seed=args.seed, names_per_title=args.names_per_title)
+    for table, path in generator.generate(args.output_dir).items():
+        print(f"{table}: {path}")
@@ -0,0 +1,134 @@
+import gzip
+import os
+import queue
+import threading
+
+
+def is_compressed(filepath) -> bool:
+    return str(filepath).endswith(".gz")
+
+
+def open_text(filepath):
+    """Abre um TSV para leitura em texto, descompactando em streaming quando é .gz."""
+    if is_compressed(filepath):
+        return gzip.open(filepath, "rt", encoding="utf-8")
+    return open(filepath, encoding="utf-8")
+
+
+def read_header(filepath, delimiter="\t") -> list:
+    opener = gzip.open if is_compressed(filepath) else open
+    with opener(filepath, "rb") as file:
+        return file.readline().decode("utf-8").rstrip("\r\n").split(delimiter)
+
+
+def prefetch_blocks(file, raw, block_size=1 << 20, depth=8):
+    """Lê blocos de linhas de file em uma thread, até depth blocos à frente do consumidor.
+
+    O zlib libera o GIL, então a descompressão acontece em paralelo com o parse
+    e a escrita no banco. Cada bloco vem junto da posição atual em raw (o
+    arquivo compactado), usada para medir o progresso.
+    """
+    blocks = queue.Queue(depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            while not stop.is_set():
+                block = file.readlines(block_size)
+                blocks.put((block, raw.tell()))
+                if not block:
+                    return
+        except BaseException as error:
+            blocks.put((error, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            block, position = blocks.get()
+            if isinstance(block, BaseException):
+                raise block
+            if not block:
+                return
+            yield block, position
+    finally:
+        # Libera a thread caso ela esteja bloqueada esperando espaço na fila
+        stop.set()
+        while thread.is_alive():
+            try:
+                blocks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+
+
+class LineReader:
+    """Percorre as linhas de dados (sem cabeçalho) que começam no intervalo de bytes [start, end).
+
+    Uma linha pertence ao intervalo em que começa, então intervalos contíguos
+    cobrem o arquivo inteiro sem repetir nem perder linhas. position guarda o
+    offset logo após a última linha entregue, usado como checkpoint, e
+    progress quantos bytes do arquivo em disco já foram lidos.
+
+    Arquivos .gz são lidos por inteiro (não podem ser fatiados) e position é
+    contado no conteúdo descompactado, então retomar de um checkpoint exige
+    descompactar de novo o trecho anterior.
+    """
+
+    def __init__(self, filepath, start=0, end=None):
+        self.filepath = filepath
+        self.start = start
+        self.end = end
+        self.position = start
+        self.progress = start
+
+    def __iter__(self):
+        if is_compressed(self.filepath):
+            yield from self._iter_compressed()
+            return
+
+        with open(self.filepath, "rb") as file:
+            if self.start == 0:
+                file.readline()
+            else:
+                file.seek(self.start - 1)
+                file.readline()
+
+            self.position = self.progress = file.tell()
+            while self.end is None or self.position < self.end:
+                line = file.readline()
+                if not line:
+                    break
+                self.position += len(line)
+                self.progress = self.position
+                yield line.decode("utf-8")
+
+    def _iter_compressed(self):
+        if self.end is not None:
+            raise ValueError(f"{self.filepath}: arquivos .gz não podem ser lidos em fatias")
+
+        with open(self.filepath, "rb") as raw, gzip.GzipFile(fileobj=raw) as file:
+            file.readline()
+            if self.start:
+                file.seek(self.start)
+            self.position = file.tell()
+            self.progress = raw.tell()
+
+            for block, self.progress in prefetch_blocks(file, raw):
+                for line in block:
+                    self.position += len(line)
+                    yield line.decode("utf-8")
+
+
+def iter_lines(filepath, start=0, end=None):
+    return iter(LineReader(filepath, start, end))
+
+
+def shard_ranges(filepath, shard_size) -> list:
+    """Divide o arquivo em intervalos de bytes de aproximadamente shard_size."""
+    size = os.path.getsize(filepath)
+    if not shard_size or size <= shard_size or is_compressed(filepath):
+        return [(0, None)]
+
+    bounds = list(range(0, size, shard_size))
+    return [(start, start + shard_size) for start in bounds[:-1]] + [(bounds[-1], None)]
@@ -13,6 +13,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 's
 from src.app.models.name_basics import NameBasics
 from src.app.models.title_basics import TitleBasics
 from src.app.models.title_crew import TitleCrew
+from src.app.models.title_crew_member import TitleCrewMember
+from src.app.models.title_genre import TitleGenre
 from src.app.models.title_principals import TitlePrincipals
 from src.app.models.title_ratings import TitleRatings
 
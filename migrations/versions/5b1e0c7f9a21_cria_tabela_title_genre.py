@@ -0,0 +1,41 @@
+"""Cria a tabela title_genre com os gêneros normalizados de title_basics
+
+Revision ID: 5b1e0c7f9a21
+Revises: 17c724293d42
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e0c7f9a21'
+down_revision: Union[str, None] = '17c724293d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('title_genre',
+    sa.Column('tconst', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('genre', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['tconst'], ['title_basics.tconst'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tconst', 'genre')
+    )
+    # Preenche a partir da coluna genres (lista separada por vírgula) dos títulos já carregados
+    op.execute("""
+        INSERT INTO title_genre (tconst, genre)
+        SELECT DISTINCT t.tconst, lower(trim(g.genre))
+        FROM title_basics t, unnest(string_to_array(t.genres, ',')) AS g(genre)
+        WHERE trim(g.genre) <> ''
+    """)
+    op.create_index(op.f('ix_title_genre_genre'), 'title_genre', ['genre'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_title_genre_genre'), table_name='title_genre')
+    op.drop_table('title_genre')
@@ -0,0 +1,36 @@
+"""ON DELETE CASCADE nas chaves de title_ratings, title_crew e title_principals para title_basics
+
+Revision ID: 6a1d94e2b7c3
+Revises: e9a3d6b0c871
+Create Date: 2026-10-18 15:32:47.206193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1d94e2b7c3'
+down_revision: Union[str, None] = 'e9a3d6b0c871'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nomes gerados pelo Postgres para as chaves sem nome da migração inicial
+TABLES = ('title_ratings', 'title_crew', 'title_principals')
+
+
+def _recreate(ondelete) -> None:
+    for table in TABLES:
+        op.drop_constraint(f'{table}_tconst_fkey', table, type_='foreignkey')
+        op.create_foreign_key(f'{table}_tconst_fkey', table, 'title_basics', ['tconst'], ['tconst'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _recreate('CASCADE')
+
+
+def downgrade() -> None:
+    _recreate(None)
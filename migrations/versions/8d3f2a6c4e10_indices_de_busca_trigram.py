@@ -0,0 +1,44 @@
+"""Índices trigram sem acentos para a busca de títulos e nomes
+
+Revision ID: 8d3f2a6c4e10
+Revises: 5b1e0c7f9a21
+Create Date: 2026-10-18 11:03:52.771940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f2a6c4e10'
+down_revision: Union[str, None] = '5b1e0c7f9a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_INDEXES = {
+    'ix_title_basics_primaryTitle_trgm': ('title_basics', 'primaryTitle'),
+    'ix_title_basics_originalTitle_trgm': ('title_basics', 'originalTitle'),
+    'ix_name_basics_primaryName_trgm': ('name_basics', 'primaryName'),
+}
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    # unaccent() é só STABLE; o wrapper com dicionário fixo pode ser IMMUTABLE e usado em índices
+    op.execute("""
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+    """)
+    for name, (table, column) in SEARCH_INDEXES.items():
+        op.execute(f'CREATE INDEX {name} ON {table} USING gin (f_unaccent(lower("{column}")) gin_trgm_ops)')
+
+
+def downgrade() -> None:
+    for name in SEARCH_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('DROP FUNCTION IF EXISTS f_unaccent(text)')
@@ -0,0 +1,47 @@
+"""Cria a tabela title_crew_member com diretores e roteiristas normalizados
+
+Revision ID: a7c41e93d5b2
+Revises: 8d3f2a6c4e10
+Create Date: 2026-10-18 11:41:07.530214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c41e93d5b2'
+down_revision: Union[str, None] = '8d3f2a6c4e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('title_crew_member',
+    sa.Column('tconst', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('nconst', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('role', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['tconst'], ['title_crew.tconst'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tconst', 'nconst', 'role')
+    )
+    # Preenche a partir das colunas directors e writers (IDs separados por vírgula) de title_crew
+    op.execute("""
+        INSERT INTO title_crew_member (tconst, nconst, role)
+        SELECT DISTINCT c.tconst, trim(m.nconst), m.role
+        FROM title_crew c
+        CROSS JOIN LATERAL (
+            SELECT unnest(string_to_array(c.directors, ',')), 'director'
+            UNION ALL
+            SELECT unnest(string_to_array(c.writers, ',')), 'writer'
+        ) AS m(nconst, role)
+        WHERE trim(m.nconst) <> ''
+    """)
+    op.create_index('ix_title_crew_member_nconst_role', 'title_crew_member', ['nconst', 'role'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_title_crew_member_nconst_role', table_name='title_crew_member')
+    op.drop_table('title_crew_member')
@@ -0,0 +1,57 @@
+"""View materializada rating_stats com estatísticas das avaliações por dimensão
+
+Revision ID: e9a3d6b0c871
+Revises: c2e85f1b7d34
+Create Date: 2026-10-18 13:05:19.842077
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a3d6b0c871'
+down_revision: Union[str, None] = 'c2e85f1b7d34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATS = """
+    count(*) AS count,
+    avg(r."averageRating") AS mean,
+    sum(r."averageRating" * r."numVotes") / nullif(sum(r."numVotes"), 0) AS weighted_mean,
+    percentile_cont(0.25) WITHIN GROUP (ORDER BY r."averageRating") AS p25,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY r."averageRating") AS median,
+    percentile_cont(0.75) WITHIN GROUP (ORDER BY r."averageRating") AS p75,
+    percentile_cont(0.9) WITHIN GROUP (ORDER BY r."averageRating") AS p90
+"""
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW rating_stats AS
+        SELECT 'title_type' AS dimension, t."titleType" AS key, {STATS}
+        FROM title_ratings r JOIN title_basics t ON t.tconst = r.tconst
+        GROUP BY t."titleType"
+        UNION ALL
+        SELECT 'genre', g.genre, {STATS}
+        FROM title_ratings r JOIN title_genre g ON g.tconst = r.tconst
+        GROUP BY g.genre
+        UNION ALL
+        SELECT 'decade', (t."startYear" / 10 * 10)::text, {STATS}
+        FROM title_ratings r JOIN title_basics t ON t.tconst = r.tconst
+        WHERE t."startYear" IS NOT NULL
+        GROUP BY t."startYear" / 10 * 10
+        UNION ALL
+        SELECT 'director', m.nconst, {STATS}
+        FROM title_ratings r JOIN title_crew_member m ON m.tconst = r.tconst AND m.role = 'director'
+        GROUP BY m.nconst
+    """)
+    # Necessário para REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_rating_stats_dimension_key', 'rating_stats', ['dimension', 'key'], unique=True)
+
+
+def downgrade() -> None:
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS rating_stats')
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class EntityCache:
+    """Cache LRU com TTL para buscas por chave primária, com contadores de acertos e falhas.
+
+    Guarda só entidades encontradas (um None não é guardado). Os repositórios
+    invalidam a chave depois do commit de cada create/update/delete; o ttl limita
+    o atraso em relação a escritas feitas fora da API (carga do IMDb) e à corrida
+    rara entre uma leitura antiga e o commit de uma escrita. As instâncias
+    guardadas ficam desanexadas da sessão quando a requisição que as carregou
+    termina e só devem ser lidas.
+    """
+
+    def __init__(self, name: str, maxsize: int = 10_000, ttl: float = 300.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: Hashable) -> Any:
+        """Como get, mas sem contar acerto/falha nem mudar a ordem do LRU."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None and entry[1] > time.monotonic() else None
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = await load()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+title_cache = EntityCache("title_basics")
+name_cache = EntityCache("name_basics")
+rating_cache = EntityCache("title_ratings")
+
+entity_caches = {cache.name: cache for cache in (title_cache, name_cache, rating_cache)}
@@ -13,6 +13,10 @@ class AppSettings:
     APP_NAME: str = config("APP_NAME", default="FastAPI app")
     APP_DESCRIPTION: str | None = config("APP_DESCRIPTION", default=None)
     APP_VERSION: str | None = config("APP_VERSION", default=None)
+    # Cache-Control das rotas de listagem, em segundos
+    LIST_CACHE_MAX_AGE: int = config("LIST_CACHE_MAX_AGE", cast=int, default=60)
+    # Linhas buscadas do cursor do servidor a cada lote nas respostas em streaming (format=ndjson|csv)
+    STREAM_BATCH_SIZE: int = config("STREAM_BATCH_SIZE", cast=int, default=1000)
 
 
 class DatabaseSettings(BaseSettings):
@@ -29,6 +33,13 @@ class PostgresSettings(DatabaseSettings):
     POSTGRES_ASYNC_PREFIX: str = config("POSTGRES_ASYNC_PREFIX", default="postgresql+asyncpg://")
     POSTGRES_URI: str = f"{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
     POSTGRES_URL: str | None = config("POSTGRES_URL", default=None)
+    POSTGRES_POOL_SIZE: int = config("POSTGRES_POOL_SIZE", cast=int, default=10)
+    POSTGRES_MAX_OVERFLOW: int = config("POSTGRES_MAX_OVERFLOW", cast=int, default=10)
+    POSTGRES_POOL_TIMEOUT: float = config("POSTGRES_POOL_TIMEOUT", cast=float, default=30.0)
+    POSTGRES_POOL_RECYCLE: int = config("POSTGRES_POOL_RECYCLE", cast=int, default=1800)
+    POSTGRES_POOL_PRE_PING: bool = config("POSTGRES_POOL_PRE_PING", cast=bool, default=True)
+    # Em milissegundos; 0 desliga. Vale só para a engine da API, não para a carga do IMDb
+    POSTGRES_STATEMENT_TIMEOUT: int = config("POSTGRES_STATEMENT_TIMEOUT", cast=int, default=30000)
 
 
 class EnvironmentOption(Enum):
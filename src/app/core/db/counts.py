@@ -0,0 +1,49 @@
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.cache import EntityCache
+
+
+class CountProvider:
+    """Totais para as respostas paginadas sem um COUNT(*) a cada requisição.
+
+    Listagens sem filtro de tabelas grandes usam a estimativa do planner
+    (pg_class.reltuples, atualizada por ANALYZE/autovacuum). Os demais totais
+    são contados uma vez e guardados por ttl segundos; os repositórios chamam
+    invalidate ao criar ou remover linhas, e o ttl limita o atraso em relação a
+    escritas feitas fora da API (carga do IMDb, outros processos). Os filtros
+    vêm do cliente, então os totais ficam em um LRU limitado a maxsize chaves.
+    """
+
+    def __init__(self, ttl: float = 60.0, estimate_above: int = 100_000, maxsize: int = 1_000):
+        self.estimate_above = estimate_above
+        self._counts = EntityCache("counts", maxsize=maxsize, ttl=ttl)
+
+    async def estimate(self, db: AsyncSession, table: str) -> int:
+        reltuples = await db.scalar(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+        )
+        # -1 (ou None) quando a tabela ainda não foi analisada
+        return int(reltuples) if reltuples is not None and reltuples >= 0 else -1
+
+    async def total(self, db: AsyncSession, query: Select, table: str, filters: tuple = ()) -> tuple:
+        """Retorna (total, estimado) para query, que lista table filtrada por filters."""
+        if not filters:
+            estimated = await self.estimate(db, table)
+            if estimated >= self.estimate_above:
+                return estimated, True
+
+        key = (table, filters)
+        cached = self._counts.get(key)
+        if cached is not None:
+            return cached, False
+
+        count = await db.scalar(select(func.count()).select_from(query.subquery()))
+        self._counts.set(key, count)
+        return count, False
+
+    def invalidate(self, table: str):
+        self._counts.invalidate_where(lambda key: key[0] == table)
+
+
+count_provider = CountProvider()
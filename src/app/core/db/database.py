@@ -1,19 +1,86 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from collections.abc import AsyncIterator, Callable
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.app.core.config import settings
+from src.app.core.db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
 DATABASE_URI = settings.POSTGRES_URI
 DATABASE_PREFIX = settings.POSTGRES_SYNC_PREFIX
 DATABASE_URL = f"{DATABASE_PREFIX}{DATABASE_URI}"
+ASYNC_DATABASE_URL = f"{settings.POSTGRES_ASYNC_PREFIX}{DATABASE_URI}"
+
+POOL_OPTIONS = {
+    "pool_size": settings.POSTGRES_POOL_SIZE,
+    "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+    "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+    "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+    "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+}
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+# Engine síncrona: carga do IMDb, criação das tabelas e scripts de manutenção
+engine = create_engine(DATABASE_URL, echo=False, future=True, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
 
 local_session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+# Engine assíncrona (asyncpg): usada pelos repositórios e rotas da API
+# O statement_timeout vale só aqui: índices, COPY e REFRESH da carga podem levar bem mais tempo
+async_connect_args = (
+    {"server_settings": {"statement_timeout": str(settings.POSTGRES_STATEMENT_TIMEOUT)}}
+    if settings.POSTGRES_STATEMENT_TIMEOUT
+    else {}
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    future=True,
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=async_connect_args,
+    **POOL_OPTIONS,
+)
+
+# Mesmo pool, mas as transações começam com BEGIN READ ONLY (sem ida extra ao banco)
+read_only_async_engine = async_engine.execution_options(postgresql_readonly=True)
+
+# expire_on_commit=False: os objetos continuam legíveis depois do commit, sem novo acesso ao banco
+local_async_session = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = local_session()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Sessão única da requisição, injetada com Depends.
+
+    Leituras rodam em uma transação somente leitura; escritas são confirmadas
+    com um único commit no fim da rota, e uma exceção na rota desfaz tudo.
+    """
+    if request.method in READ_ONLY_METHODS:
+        async with local_async_session(bind=read_only_async_engine) as db:
+            yield db
+        return
+
+    async with local_async_session() as db:
+        yield db
+        await db.commit()
+
+def on_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Agenda callback para depois do commit da transação atual de db; é descartado em um rollback."""
+    db.info.setdefault("on_commit", []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop("on_commit", []):
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_commit(session: Session) -> None:
+    session.info.pop("on_commit", None)
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Espera por conexões do pool: quantos estão bloqueados agora e um histograma dos tempos.
+
+    waiters conta só as retiradas que encontraram o pool sem conexão livre e sem
+    overflow disponível; o histograma mede todas as retiradas. Ele é cumulativo (cada faixa conta as esperas menores ou iguais ao
+    limite), no mesmo formato dos histogramas do Prometheus.
+    """
+
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waiters = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_seconds_sum = 0.0
+        self._bucket_counts = [0] * len(self.BUCKETS)
+
+    def start(self, blocked: bool):
+        if blocked:
+            with self._lock:
+                self.waiters += 1
+        return time.perf_counter()
+
+    def finish(self, started: float, blocked: bool, outcome: str = "ok"):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            if blocked:
+                self.waiters -= 1
+            if outcome == "timeout":
+                self.timeouts += 1
+            if outcome != "ok":
+                return
+            self.wait_count += 1
+            self.wait_seconds_sum += elapsed
+            for index, limit in enumerate(self.BUCKETS):
+                if elapsed <= limit:
+                    self._bucket_counts[index] += 1
+                    break
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            histogram = {}
+            cumulative = 0
+            for limit, count in zip(self.BUCKETS, self._bucket_counts):
+                cumulative += count
+                histogram[str(limit)] = cumulative
+            histogram["+Inf"] = self.wait_count
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "waiters": self.waiters,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_seconds_sum": round(self.wait_seconds_sum, 6),
+                "wait_histogram": histogram,
+            }
+
+
+class _InstrumentedPool:
+    # Fica na classe e não na instância porque o SQLAlchemy recria o pool (dispose, invalidação)
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        # Mesma condição em que o QueuePool bloqueia na fila: nenhuma conexão livre e o overflow esgotado
+        blocked = self._pool.empty() and -1 < self._max_overflow <= self._overflow
+        # Inclui o tempo de abrir uma conexão nova quando o pool ainda pode crescer
+        started = self.metrics.start(blocked)
+        outcome = "error"
+        try:
+            connection = super()._do_get()
+            outcome = "ok"
+            return connection
+        except TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            self.metrics.finish(started, blocked, outcome)
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
@@ -0,0 +1,71 @@
+import logging
+import threading
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, text
+
+from src.app.core.db.database import engine
+
+DIMENSIONS = ("title_type", "genre", "decade", "director")
+
+# View materializada criada pela migração; fica fora do SQLModel.metadata para o create_all não criar uma tabela
+rating_stats = Table(
+    "rating_stats",
+    MetaData(),
+    Column("dimension", String, primary_key=True),
+    Column("key", String, primary_key=True),
+    Column("count", Integer),
+    Column("mean", Float),
+    Column("weighted_mean", Float),
+    Column("p25", Float),
+    Column("median", Float),
+    Column("p75", Float),
+    Column("p90", Float),
+)
+
+
+def refresh_rating_stats(concurrently: bool = True):
+    """Atualiza rating_stats; CONCURRENTLY não bloqueia as leituras durante o refresh."""
+    with engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        if connection.execute(text("SELECT to_regclass('rating_stats')")).scalar() is None:
+            return False
+        mode = "CONCURRENTLY " if concurrently else ""
+        connection.execute(text(f"REFRESH MATERIALIZED VIEW {mode}rating_stats"))
+    return True
+
+
+class RatingStatsRefresher:
+    """Agrupa as escritas de uma janela de delay segundos em um único refresh.
+
+    A view lê title_ratings, title_basics (titleType, startYear), title_genre e
+    title_crew_member; os repositórios dessas tabelas chamam schedule após o commit.
+
+    A primeira escrita agenda o refresh e as seguintes, até ele rodar, não
+    agendam outro; as estatísticas ficam no máximo delay segundos atrasadas.
+    """
+
+    def __init__(self, delay: float = 30.0):
+        self.delay = delay
+        self.logger = logging.getLogger(__name__)
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def schedule(self):
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.delay, self.refresh)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def refresh(self):
+        with self._lock:
+            self._timer = None
+        try:
+            refresh_rating_stats()
+            self.logger.info("rating_stats atualizada")
+        except Exception:
+            self.logger.exception("Erro ao atualizar rating_stats")
+
+
+rating_stats_refresher = RatingStatsRefresher()
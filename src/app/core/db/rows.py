@@ -0,0 +1,19 @@
+from typing import List
+
+from sqlalchemy import Result, Select, select
+
+
+def select_columns(model, *extra) -> Select:
+    """select das colunas da tabela do modelo; devolve Rows em vez de objetos ORM.
+
+    Para listas só de leitura: sem identity map nem estado de instância por
+    linha. As linhas seguem para os DTOs via as_dicts.
+    """
+    return select(*model.__table__.columns, *extra)
+
+
+def as_dicts(result: Result) -> List[dict]:
+    # O pydantic valida um dict bem mais rápido que lendo atributos de uma Row
+    # (from_attributes), e os nomes das colunas são lidos uma vez, não por linha
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
@@ -0,0 +1,74 @@
+from typing import Type
+
+from pydantic import BaseModel
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.rows import as_dicts, select_columns
+from src.app.dtos.PaginationResultDto import PaginationResultDto
+
+
+def normalize(expression):
+    """Minúsculas e sem acentos; é a mesma expressão dos índices trigram criados na migração."""
+    return func.f_unaccent(func.lower(expression))
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains(column, term: str):
+    """column contém term, ignorando maiúsculas e acentos; usa o índice trigram da coluna."""
+    return normalize(column).like(normalize(literal(f"%{_escape_like(term.strip())}%")), escape="\\")
+
+
+def text_search(term: str, *columns):
+    """Condição e relevância de uma busca por term nas colunas, tolerante a acentos e erros de digitação.
+
+    Uma linha casa se contém o termo (LIKE) ou se alguma palavra dela é parecida
+    com o termo (operador <% do pg_trgm); as duas formas usam os índices GIN.
+    A relevância é a maior word_similarity entre o termo e as colunas.
+    """
+    needle = normalize(literal(term.strip()))
+
+    conditions = []
+    similarities = []
+    for column in columns:
+        value = normalize(column)
+        conditions.append(or_(needle.op("<%")(value), contains(column, term)))
+        similarities.append(func.word_similarity(needle, value))
+
+    rank = similarities[0] if len(similarities) == 1 else func.greatest(*similarities)
+    return or_(*conditions), rank
+
+
+async def search_page(
+    db: AsyncSession, model, dto: Type[BaseModel], term: str, columns, page: int = 1, limit: int = 10
+) -> PaginationResultDto:
+    """Página de resultados ordenada por relevância, com o total calculado na mesma consulta."""
+    condition, rank = text_search(term, *columns)
+    keys = model.__table__.primary_key.columns
+    result = await db.execute(
+        select_columns(model, func.count().over().label("total_items"))
+        .where(condition)
+        .order_by(rank.desc(), *keys)
+        .offset((page - 1) * limit)
+        .limit(limit)
+    )
+    rows = result.all()
+
+    if rows:
+        total_items = rows[0].total_items
+    elif page > 1:
+        # Página além do fim: sem linhas não há count() over(), então o total é contado à parte
+        total_items = await db.scalar(select(func.count()).select_from(model).where(condition))
+    else:
+        total_items = 0
+
+    return PaginationResultDto[dto](
+        page=page,
+        limit=limit,
+        total_items=total_items,
+        number_of_pages=(total_items + limit - 1) // limit,
+        data=as_dicts(rows)
+    )
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from sqlalchemy import literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def row_version(model):
+    """Versão da linha: o xmin do Postgres, que é novo a cada INSERT e a cada UPDATE da linha."""
+    return literal_column(f"{model.__tablename__}.xmin::text").label("version")
+
+
+def _primary_key(model):
+    (column,) = model.__table__.primary_key.columns
+    return column
+
+
+async def load_versioned(db: AsyncSession, model, key) -> Optional[tuple]:
+    """(entidade, versão) da linha com a chave primária key, ou None."""
+    row = (await db.execute(select(model, row_version(model)).where(_primary_key(model) == key))).first()
+    return (row[0], row[1]) if row else None
+
+
+async def current_version(db: AsyncSession, model, key) -> Optional[str]:
+    """Só a versão da linha, sem trazer as colunas."""
+    return await db.scalar(select(row_version(model)).where(_primary_key(model) == key))
@@ -0,0 +1,59 @@
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+from src.app.core.config import settings
+
+# Entidades: o cliente pode guardar a resposta, mas revalida com If-None-Match a cada uso
+ENTITY_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110): W/ é ignorado e * casa com qualquer versão."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    version: Callable[[], Awaitable[Optional[str]]],
+    load: Callable[[], Awaitable[Optional[tuple]]],
+) -> Any:
+    """Entidade com ETag, ou 304 se o If-None-Match do cliente ainda vale.
+
+    Com If-None-Match só a versão é consultada; a entidade não é buscada nem
+    serializada quando não mudou. Retorna None se a entidade não existe.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        current = await version()
+        if current is not None and etag_matches(if_none_match, make_etag(current)):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": make_etag(current), "Cache-Control": ENTITY_CACHE_CONTROL},
+            )
+
+    found = await load()
+    if found is None:
+        return None
+    entity, current = found
+    response.headers["ETag"] = make_etag(current)
+    response.headers["Cache-Control"] = ENTITY_CACHE_CONTROL
+    return entity
+
+
+def list_cache_header() -> str:
+    return f"public, max-age={settings.LIST_CACHE_MAX_AGE}"
+
+
+def list_cache_control(response: Response):
+    """Dependência das rotas de listagem: respostas podem ser reaproveitadas por alguns segundos."""
+    response.headers["Cache-Control"] = list_cache_header()
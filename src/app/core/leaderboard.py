@@ -0,0 +1,111 @@
+import bisect
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.models.title_ratings import TitleRatings
+
+
+class Leaderboard:
+    """As capacity avaliações com maior valor em uma coluna de title_ratings, em ordem, em memória.
+
+    É construída com uma consulta ao índice (coluna, tconst) e depois mantida a
+    cada create/update/delete da API, então um top-N não ordena a tabela. A
+    lista sempre contém exatamente os primeiros colocados: uma avaliação que cai
+    abaixo do último sai da lista, que encolhe, e quando ela fica menor que o N
+    pedido (ou passa de ttl segundos, por causa de escritas fora da API) é
+    reconstruída. Empates seguem a ordem decrescente de tconst, como no índice.
+    """
+
+    def __init__(self, column: str, capacity: int = 100, ttl: float = 600.0):
+        self.column = column
+        self.capacity = capacity
+        self.ttl = ttl
+        self._keys = []  # (valor, tconst) em ordem crescente; o primeiro colocado é o último
+        self._rows = {}
+        # True quando a tabela inteira cabe na lista: toda avaliação nova entra
+        self._exhaustive = False
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _key(self, rating: TitleRatings) -> tuple:
+        return getattr(rating, self.column), rating.tconst
+
+    def _query(self, limit: int):
+        order = getattr(TitleRatings, self.column)
+        return select(TitleRatings).order_by(order.desc(), TitleRatings.tconst.desc()).limit(limit)
+
+    async def build(self, db: AsyncSession):
+        rows = (await db.scalars(self._query(self.capacity))).all()
+        # Cópias fora da sessão: a lista é compartilhada entre requisições
+        copies = [TitleRatings(tconst=row.tconst, averageRating=row.averageRating, numVotes=row.numVotes) for row in rows]
+        with self._lock:
+            self._rows = {row.tconst: row for row in copies}
+            self._keys = sorted(self._key(row) for row in copies)
+            self._exhaustive = len(copies) < self.capacity
+            self._expires_at = time.monotonic() + self.ttl
+
+    def top(self, n: int) -> Optional[List[TitleRatings]]:
+        """Os n primeiros colocados, ou None se a lista precisa ser reconstruída antes."""
+        with self._lock:
+            if time.monotonic() >= self._expires_at or (len(self._keys) < n and not self._exhaustive):
+                return None
+            return [self._rows[tconst] for _, tconst in reversed(self._keys[-n:])]
+
+    async def get(self, db: AsyncSession, n: int) -> List[TitleRatings]:
+        rows = self.top(n)
+        if rows is None:
+            await self.build(db)
+            rows = self.top(n)
+        if rows is None:
+            # n maior que a capacidade (ou uma remoção logo depois da reconstrução): consulta direta
+            rows = list((await db.scalars(self._query(n))).all())
+        return rows
+
+    def _discard(self, tconst: str):
+        row = self._rows.pop(tconst, None)
+        if row is not None:
+            del self._keys[bisect.bisect_left(self._keys, self._key(row))]
+
+    def upsert(self, rating: TitleRatings):
+        row = TitleRatings(tconst=rating.tconst, averageRating=rating.averageRating, numVotes=rating.numVotes)
+        key = self._key(row)
+        with self._lock:
+            self._discard(row.tconst)
+            # Abaixo do último colocado só entra se a lista tiver a tabela inteira
+            if not self._exhaustive and (not self._keys or key < self._keys[0]):
+                return
+            bisect.insort(self._keys, key)
+            self._rows[row.tconst] = row
+            if len(self._keys) > self.capacity:
+                _, dropped = self._keys.pop(0)
+                del self._rows[dropped]
+                self._exhaustive = False
+
+    def remove(self, tconst: str):
+        with self._lock:
+            self._discard(tconst)
+
+
+rating_leaderboard = Leaderboard("averageRating")
+votes_leaderboard = Leaderboard("numVotes")
+
+leaderboards = (rating_leaderboard, votes_leaderboard)
+
+
+def update_leaderboards(rating: TitleRatings):
+    for leaderboard in leaderboards:
+        leaderboard.upsert(rating)
+
+
+def remove_from_leaderboards(tconst: str):
+    for leaderboard in leaderboards:
+        leaderboard.remove(tconst)
+
+
+async def build_leaderboards(db: AsyncSession):
+    for leaderboard in leaderboards:
+        await leaderboard.build(db)
@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+from typing import Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.rows import as_dicts
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
+
+
+def encode_cursor(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def _python_type(column) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        # TypeDecorators como o AutoString do SQLModel só informam o tipo pelo tipo que envolvem
+        return column.type.impl_instance.python_type
+
+
+def _matches(value, python_type: type) -> bool:
+    # bool é subclasse de int no Python, mas não é um valor válido para uma coluna numérica
+    if isinstance(value, bool):
+        return python_type is bool
+    if python_type is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, python_type)
+
+
+def decode_cursor(cursor: str, keys: list) -> list:
+    """Valores do cursor, um por chave e do tipo da coluna; None só em colunas que aceitam nulo.
+
+    Um cursor com valor de outro tipo chegaria ao banco e viraria um erro 500
+    do driver, então é recusado aqui como ValueError.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Cursor inválido")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Cursor inválido")
+    for key, value in zip(keys, values):
+        column = key.expression
+        if value is None:
+            if not getattr(column, "nullable", True):
+                raise ValueError("Cursor inválido")
+        elif not _matches(value, _python_type(column)):
+            raise ValueError("Cursor inválido")
+    return values
+
+
+async def keyset_page(
+    db: AsyncSession, query: Select, keys: list, cursor: Optional[str], limit: int, dto: Type[BaseModel]
+) -> CursorPaginationResultDto:
+    """Página ordenada por keys que começa logo após o cursor, sem OFFSET nem count().
+
+    keys deve terminar na chave primária para que a ordem seja total; a
+    comparação por tupla usa o índice sobre essas colunas, então o custo de
+    uma página não depende de quantas vieram antes. query deve selecionar
+    colunas (select_columns); as linhas viram dto na resposta.
+    """
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        query = query.where(tuple_(*keys) > tuple_(*values))
+
+    data = as_dicts(await db.execute(query.order_by(*keys).limit(limit + 1)))
+    next_cursor = None
+    if len(data) > limit:
+        data = data[:limit]
+        next_cursor = encode_cursor([data[-1][key.key] for key in keys])
+
+    return CursorPaginationResultDto[dto](limit=limit, next_cursor=next_cursor, data=data)
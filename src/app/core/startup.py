@@ -6,10 +6,12 @@ import fastapi
 from fastapi import FastAPI, APIRouter
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import ORJSONResponse
 from sqlmodel import SQLModel, create_engine
 
 from src.app.core.config import DatabaseSettings, AppSettings, EnvironmentSettings, EnvironmentOption
-from src.app.core.db.database import engine
+from src.app.core.db.database import engine, local_async_session, read_only_async_engine
+from src.app.core.leaderboard import build_leaderboards
 
 
 # --------------------------- database ---------------------------
@@ -17,6 +19,10 @@ def create_tables() -> None:
     with engine.begin() as conn:
         SQLModel.metadata.create_all(bind=conn.engine)
 
+async def load_leaderboards() -> None:
+    async with local_async_session(bind=read_only_async_engine) as db:
+        await build_leaderboards(db)
+
 # --------------------------- application ---------------------------
 def lifespan_factory(
         settings: (
@@ -32,6 +38,7 @@ def lifespan_factory(
 
         if isinstance(settings, DatabaseSettings) and create_tables_on_start:
             create_tables()
+            await load_leaderboards()
 
         yield
 
@@ -58,6 +65,10 @@ def create_application(
     if isinstance(settings, EnvironmentSettings):
         kwargs.update({"docs_url": None, "redoc_url": None, "openapi_url": None})
 
+    # orjson serializa as respostas bem mais rápido que o json da biblioteca padrão. Só a
+    # codificação muda: o FastAPI continua validando cada resposta contra o response_model
+    kwargs.setdefault("default_response_class", ORJSONResponse)
+
     lifespan = lifespan_factory(settings, create_tables_on_start = create_tables_on_start)
 
     application = FastAPI(lifespan = lifespan, **kwargs)
@@ -0,0 +1,89 @@
+import csv
+import io
+import logging
+from collections.abc import AsyncIterator
+from enum import Enum
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from src.app.core.config import settings
+from src.app.core.db.database import local_async_session, read_only_async_engine
+from src.app.core.etag import list_cache_header
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ResponseFormat.NDJSON: "application/x-ndjson",
+    ResponseFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+async def _batches(query: Select, batch_size: int) -> AsyncIterator[list]:
+    """Linhas em lotes de batch_size, lidas de um cursor do servidor.
+
+    Usa uma sessão própria: a sessão da requisição já foi fechada quando o
+    corpo da resposta começa a ser enviado.
+    """
+    async with local_async_session(bind=read_only_async_engine) as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+
+def _keys(query: Select) -> list:
+    return [column.key for column in query.selected_columns]
+
+
+async def _ndjson(query: Select, batch_size: int) -> AsyncIterator[bytes]:
+    keys = _keys(query)
+    async for rows in _batches(query, batch_size):
+        yield b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+async def _csv(query: Select, batch_size: int) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    # O cabeçalho sai antes da consulta, então o cliente recebe o primeiro byte sem esperar o banco
+    writer.writerow(_keys(query))
+    yield buffer.getvalue()
+    async for rows in _batches(query, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+async def _logged(chunks: AsyncIterator, description: str) -> AsyncIterator:
+    # Depois do primeiro lote o status já foi enviado: um erro só pode ser registrado e encerrar a conexão
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except Exception:
+        logger.exception(f"Erro durante o streaming de {description}")
+        raise
+
+
+def stream_response(query: Select, response_format: ResponseFormat, description: str) -> StreamingResponse:
+    """Resposta em NDJSON ou CSV emitida lote a lote; a memória fica limitada ao tamanho do lote.
+
+    query deve selecionar colunas (select_columns); os nomes delas são as chaves
+    do NDJSON e o cabeçalho do CSV. Os cabeçalhos postos pelas dependências na
+    Response injetada não valem para uma resposta devolvida diretamente, então
+    o Cache-Control das listagens é repetido aqui.
+    """
+    encoder = _ndjson if response_format == ResponseFormat.NDJSON else _csv
+    chunks = encoder(query, settings.STREAM_BATCH_SIZE)
+    return StreamingResponse(
+        _logged(chunks, description),
+        media_type=MEDIA_TYPES[response_format],
+        headers={"Cache-Control": list_cache_header()},
+    )
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class CacheStatsDto(BaseModel):
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
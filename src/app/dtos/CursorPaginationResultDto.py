@@ -0,0 +1,11 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CursorPaginationResultDto(BaseModel, Generic[T]):
+    limit: int
+    next_cursor: Optional[str] = None  # None quando não há próxima página
+    data: List[T]
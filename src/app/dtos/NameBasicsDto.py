@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class NameBasicsDto(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    nconst: str
+    primaryName: str
+    birthYear: Optional[int] = None
+    deathYear: Optional[int] = None
+    primaryProfession: Optional[str] = None
+    knownForTitles: Optional[str] = None
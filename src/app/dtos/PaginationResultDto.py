@@ -1,9 +1,14 @@
+from typing import Generic, List, TypeVar
+
 from pydantic import BaseModel
 
+T = TypeVar("T")
+
 
-class PaginationResultDto(BaseModel):
+class PaginationResultDto(BaseModel, Generic[T]):
     page: int
     limit: int
     total_items: int
     number_of_pages: int
-    data: list
\ No newline at end of file
+    data: List[T]
+    total_is_estimated: bool = False  # True quando total_items vem da estimativa do planner
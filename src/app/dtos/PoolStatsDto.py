@@ -0,0 +1,20 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class PoolStatsDto(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    waiters: int  # Retiradas bloqueadas agora: sem conexão livre e com o overflow esgotado
+    timeouts: int
+    wait_count: int
+    wait_seconds_sum: float
+    wait_histogram: Dict[str, int]  # Limite da faixa em segundos -> esperas acumuladas até ele
+
+
+class PoolMetricsDto(BaseModel):
+    api: PoolStatsDto
+    sync: PoolStatsDto
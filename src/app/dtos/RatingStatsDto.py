@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RatingStatsDto(BaseModel):
+    dimension: str
+    key: str
+    name: Optional[str] = None  # Nome do diretor quando dimension é director
+    count: int
+    mean: float
+    weighted_mean: Optional[float] = None
+    p25: float
+    median: float
+    p75: float
+    p90: float
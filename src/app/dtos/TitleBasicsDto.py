@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TitleBasicsDto(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tconst: str
+    titleType: str
+    primaryTitle: str
+    originalTitle: str
+    isAdult: bool
+    startYear: Optional[int] = None
+    endYear: Optional[int] = None
+    runtimeMinutes: Optional[int] = None
+    genres: Optional[str] = None
@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TitleCrewDto(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tconst: str
+    directors: Optional[str] = None
+    writers: Optional[str] = None
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TitlePrincipalsDto(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tconst: str
+    ordering: int
+    nconst: str
+    category: str
+    job: Optional[str] = None
+    characters: Optional[str] = None
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class TitleRatingsDto(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tconst: str
+    averageRating: float
+    numVotes: int
@@ -10,23 +10,26 @@ class TitleBasics(SQLModel, table=True):
     primaryTitle: str = Field(..., description="Título principal")
     originalTitle: str = Field(..., description="Título original")
     isAdult: bool = Field(..., description="Indica se é título adulto (True/False)")
-    startYear: Optional[int] = Field(default=None, description="Ano de início (lançamento)")
+    startYear: Optional[int] = Field(default=None, index=True, description="Ano de início (lançamento)")
     endYear: Optional[int] = Field(default=None, description="Ano de término, se aplicável")
     runtimeMinutes: Optional[int] = Field(default=None, description="Duração em minutos")
     genres: Optional[str] = Field(default=None, description="Gêneros (lista separada por vírgula)")
 
+    # Avaliação, equipe e elenco saem junto com o título pelo ON DELETE CASCADE das chaves;
+    # passive_deletes evita que o ORM carregue essas linhas só para apagá-las
     # Relação 1:1 com TitleRatings
-    rating: Optional["TitleRatings"] = Relationship(back_populates="title", sa_relationship_kwargs={"uselist": False})
+    rating: Optional["TitleRatings"] = Relationship(back_populates="title", cascade_delete=True, passive_deletes=True, sa_relationship_kwargs={"uselist": False})
 
     # Relação 1:1 com TitleCrew
-    crew: Optional["TitleCrew"] = Relationship(back_populates="title", sa_relationship_kwargs={"uselist": False})
+    crew: Optional["TitleCrew"] = Relationship(back_populates="title", cascade_delete=True, passive_deletes=True, sa_relationship_kwargs={"uselist": False})
 
     # Relação 1:N com TitlePrincipals (um título pode ter vários profissionais)
-    principals: List["TitlePrincipals"] = Relationship(back_populates="title")
+    principals: List["TitlePrincipals"] = Relationship(back_populates="title", cascade_delete=True, passive_deletes=True)
 
     # Relação N:M com NameBasics via tabela de associação TitlePrincipals
     names: List["NameBasics"] = Relationship(
         back_populates="titles",
         link_model=TitlePrincipals,
+        passive_deletes=True,
         sa_relationship_kwargs={"overlaps": "principals,title"}  # Adicione o parâmetro overlaps aqui
     )
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, Index
+
+
+class TitleCrewMember(SQLModel, table=True):
+    __tablename__ = "title_crew_member"
+    __table_args__ = (Index("ix_title_crew_member_nconst_role", "nconst", "role"),)
+
+    # Chave composta: (tconst, nconst, role)
+    tconst: str = Field(foreign_key="title_crew.tconst", primary_key=True, ondelete="CASCADE", description="Chave estrangeira para TitleCrew")
+    nconst: str = Field(primary_key=True, description="Identificador da pessoa (NameBasics)")
+    role: str = Field(primary_key=True, description="Função na equipe (director ou writer)")
+
+
+def crew_members(tconst: str, directors: Optional[str], writers: Optional[str]) -> list:
+    """Separa as colunas directors e writers de TitleCrew nas linhas guardadas em TitleCrewMember."""
+    members = []
+    for role, ids in (("director", directors), ("writer", writers)):
+        for nconst in sorted({nconst.strip() for nconst in (ids or "").split(",") if nconst.strip()}):
+            members.append(TitleCrewMember(tconst=tconst, nconst=nconst, role=role))
+    return members
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+
+class TitleGenre(SQLModel, table=True):
+    __tablename__ = "title_genre"
+
+    # Chave composta: (tconst, genre)
+    tconst: str = Field(foreign_key="title_basics.tconst", primary_key=True, ondelete="CASCADE", description="Chave estrangeira para TitleBasics")
+    genre: str = Field(primary_key=True, index=True, description="Gênero em minúsculas (ex.: drama, reality-tv)")
+
+
+def genre_names(genres: Optional[str]) -> list:
+    """Separa a coluna genres de TitleBasics nos nomes normalizados guardados em TitleGenre."""
+    if not genres:
+        return []
+    return sorted({genre.strip().lower() for genre in genres.split(",") if genre.strip()})
@@ -1,12 +1,17 @@
 from typing import Optional
 
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 
 
 class TitleRatings(SQLModel, table=True):
     __tablename__ = "title_ratings"
+    # A chave primária no fim desempata a ordenação e atende a paginação por cursor
+    __table_args__ = (
+        Index("ix_title_ratings_averageRating_tconst", "averageRating", "tconst"),
+        Index("ix_title_ratings_numVotes_tconst", "numVotes", "tconst"),
+    )
 
-    tconst: str = Field(foreign_key="title_basics.tconst", primary_key=True, description="Chave estrangeira para TitleBasics")
+    tconst: str = Field(foreign_key="title_basics.tconst", primary_key=True, ondelete="CASCADE", description="Chave estrangeira para TitleBasics")
     averageRating: float = Field(..., description="Média ponderada das avaliações")
     numVotes: int = Field(..., description="Número de votos recebidos")
 
@@ -1,9 +1,18 @@
 import logging
 from src.app.models.name_basics import NameBasics
-from typing import Optional, List
-from sqlalchemy.orm import joinedload
+from typing import Optional, List, Tuple
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from src.app.core.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.app.core.cache import name_cache
+from src.app.core.db.counts import count_provider
+from src.app.core.db.database import on_commit
+from src.app.core.db.rows import as_dicts, select_columns
+from src.app.core.db.versions import current_version, load_versioned
+from src.app.core.db.search import search_page
+from src.app.core.pagination import keyset_page
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
+from src.app.dtos.NameBasicsDto import NameBasicsDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
 
 
@@ -11,65 +20,69 @@ class NameBasicsRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def create(self, name: NameBasics) -> NameBasics:
+    async def create(self, db: AsyncSession, name: NameBasics) -> NameBasics:
         try:
-            with next(get_db()) as db:
-                db.add(name)
-                db.commit()
-                db.refresh(name)
-                self.logger.info("Nome criado com sucesso!")
-                return name
+            db.add(name)
+            await db.flush()
+            on_commit(db, lambda: count_provider.invalidate("name_basics"))
+            on_commit(db, lambda: name_cache.invalidate(name.nconst))
+            self.logger.info("Nome criado com sucesso!")
+            return name
         except IntegrityError:
             self.logger.error("Erro ao criar nome!")
             raise ValueError("Erro ao criar nome!")
     
-    def get_by_nconst(self, nconst: str) -> Optional[NameBasics]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando nome com nconst {nconst}")
-            return db.query(NameBasics).filter(NameBasics.nconst == nconst).first()
-    
-    def get_all(self, page: int = 1, limit: int = 10) -> PaginationResultDto:
-        with next(get_db()) as db:
-            query = db.query(NameBasics)
-            total_items = query.count()
-            number_of_pages = (total_items + limit - 1) // limit
-            data = query.offset((page - 1) * limit).limit(limit).all()
+    async def get_by_nconst(self, db: AsyncSession, nconst: str) -> Optional[NameBasics]:
+        found = await self.get_versioned(db, nconst)
+        return found[0] if found else None
+
+    async def get_versioned(self, db: AsyncSession, nconst: str) -> Optional[Tuple[NameBasics, str]]:
+        """(nome, versão da linha); usado para o ETag."""
+        self.logger.info(f"Buscando nome com nconst {nconst}")
+        return await name_cache.get_or_load(nconst, lambda: load_versioned(db, NameBasics, nconst))
 
-            return PaginationResultDto(
-                page=page,
-                limit=limit,
-                total_items=total_items,
-                number_of_pages=number_of_pages,
-                data=data
-            )
+    async def get_version(self, db: AsyncSession, nconst: str) -> Optional[str]:
+        cached = name_cache.peek(nconst)
+        return cached[1] if cached else await current_version(db, NameBasics, nconst)
     
-    def search_by_name(self, name: str, page: int = 1, limit: int = 10) -> PaginationResultDto:
-        with next(get_db()) as db:
-            query = db.query(NameBasics).filter(NameBasics.primaryName.ilike(f"%{name}%"))
-            total_items = query.count()
-            number_of_pages = (total_items + limit - 1) // limit
-            data = query.offset((page - 1) * limit).limit(limit).all()
+    async def get_all(self, db: AsyncSession, page: int = 1, limit: int = 10) -> PaginationResultDto:
+        query = select_columns(NameBasics)
+        total_items, estimated = await count_provider.total(db, query, "name_basics")
+        number_of_pages = (total_items + limit - 1) // limit
+        data = as_dicts(await db.execute(query.offset((page - 1) * limit).limit(limit)))
 
-            return PaginationResultDto(
-                page=page,
-                limit=limit,
-                total_items=total_items,
-                number_of_pages=number_of_pages,
-                data=data
-            )
+        return PaginationResultDto[NameBasicsDto](
+            page=page,
+            limit=limit,
+            total_items=total_items,
+            number_of_pages=number_of_pages,
+            data=data,
+            total_is_estimated=estimated
+        )
+    
+    async def get_all_keyset(self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 10) -> CursorPaginationResultDto:
+        self.logger.info(f"Buscando nomes após o cursor {cursor}")
+        return await keyset_page(db, select_columns(NameBasics), [NameBasics.nconst], cursor, limit, NameBasicsDto)
+    
+    async def search_by_name(self, db: AsyncSession, name: str, page: int = 1, limit: int = 10) -> PaginationResultDto:
+        self.logger.info(f"Buscando nomes parecidos com {name}")
+        return await search_page(db, NameBasics, NameBasicsDto, name, (NameBasics.primaryName,), page, limit)
     
-    def get_known_for_titles(self, nconst: str) -> List[str]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando títulos conhecidos para nconst {nconst}")
-            return db.query(NameBasics.knownForTitles).filter(NameBasics.nconst == nconst).first()
+    async def get_known_for_titles(self, db: AsyncSession, nconst: str) -> List[str]:
+        self.logger.info(f"Buscando títulos conhecidos para nconst {nconst}")
+        result = await db.execute(select(NameBasics.knownForTitles).where(NameBasics.nconst == nconst))
+        return result.first()
         
-    def get_title_by_id(self, nconst: str, tconst: str) -> Optional[str]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando título {tconst} para nconst {nconst}")
-            return db.query(NameBasics.knownForTitles).filter(NameBasics.nconst == nconst).filter(NameBasics.knownForTitles.contains(tconst)).first()
+    async def get_title_by_id(self, db: AsyncSession, nconst: str, tconst: str) -> Optional[str]:
+        self.logger.info(f"Buscando título {tconst} para nconst {nconst}")
+        result = await db.execute(
+            select(NameBasics.knownForTitles)
+            .where(NameBasics.nconst == nconst)
+            .where(NameBasics.knownForTitles.contains(tconst))
+        )
+        return result.first()
     
-    def get_professions(self, nconst: str) -> List[str]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando profissões para nconst {nconst}")
-            return db.query(NameBasics.primaryProfession).filter(NameBasics.nconst == nconst).first()
-        
\ No newline at end of file
+    async def get_professions(self, db: AsyncSession, nconst: str) -> List[str]:
+        self.logger.info(f"Buscando profissões para nconst {nconst}")
+        result = await db.execute(select(NameBasics.primaryProfession).where(NameBasics.nconst == nconst))
+        return result.first()
@@ -1,13 +1,26 @@
 import logging
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from sqlalchemy import Select, select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
-
-from src.app.core.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.cache import rating_cache, title_cache
+from src.app.core.db.counts import count_provider
+from src.app.core.db.database import on_commit
+from src.app.core.db.rating_stats import rating_stats_refresher
+from src.app.core.db.rows import as_dicts, select_columns
+from src.app.core.db.versions import current_version, load_versioned
+from src.app.core.db.search import contains, search_page
+from src.app.core.leaderboard import rating_leaderboard, remove_from_leaderboards
+from src.app.core.pagination import keyset_page
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
+from src.app.dtos.TitleBasicsDto import TitleBasicsDto
 from src.app.models.title_basics import TitleBasics
 from src.app.models.title_ratings import TitleRatings
-from src.app.models.title_crew import TitleCrew
+from src.app.models.title_crew_member import TitleCrewMember
+from src.app.models.title_genre import TitleGenre, genre_names
 from src.app.models.title_principals import TitlePrincipals
 from src.app.models.name_basics import NameBasics
 
@@ -16,131 +29,146 @@ class TitleBasicsRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def create(self, title: TitleBasics) -> TitleBasics:
+    async def create(self, db: AsyncSession, title: TitleBasics) -> TitleBasics:
         try:
-            with next(get_db()) as db:
-                db.add(title)
-                db.commit()
-                db.refresh(title)
-                self.logger.info("Título criado com sucesso!")
-                return title
+            db.add(title)
+            await db.flush()
+            db.add_all(TitleGenre(tconst=title.tconst, genre=genre) for genre in genre_names(title.genres))
+            await db.flush()
+            on_commit(db, lambda: count_provider.invalidate("title_basics"))
+            on_commit(db, lambda: title_cache.invalidate(title.tconst))
+            on_commit(db, rating_stats_refresher.schedule)
+            self.logger.info("Título criado com sucesso!")
+            return title
         except IntegrityError:
             self.logger.error("Erro ao criar título!")
             raise ValueError("Erro ao criar título!")
 
-    def get_by_tconst(self, tconst: str) -> Optional[TitleBasics]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando título com tconst {tconst}")
-            return db.query(TitleBasics).filter(TitleBasics.tconst == tconst).first()
-
-    def get_all(self, page: int = 1, limit: int = 10) -> PaginationResultDto:
-        with next(get_db()) as db:
-            query = db.query(TitleBasics)
-            total_items = query.count()
-            number_of_pages = (total_items + limit - 1) // limit
-            data = query.offset((page - 1) * limit).limit(limit).all()
-
-            return PaginationResultDto(
-                page=page,
-                limit=limit,
-                total_items=total_items,
-                number_of_pages=number_of_pages,
-                data=data
-            )
-
-    def search_by_title(self, title: str, page: int = 1, limit: int = 10) -> PaginationResultDto:
-        with next(get_db()) as db:
-            query = db.query(TitleBasics).filter(TitleBasics.primaryTitle.ilike(f"%{title}%"))
-            total_items = query.count()
-            number_of_pages = (total_items + limit - 1) // limit
-            data = query.offset((page - 1) * limit).limit(limit).all()
-
-            return PaginationResultDto(
-                page=page,
-                limit=limit,
-                total_items=total_items,
-                number_of_pages=number_of_pages,
-                data=data
-            )
-
-    def get_by_genre(self, genre: str, min_rating: Optional[float] = None) -> List[TitleBasics]:
-        with next(get_db()) as db:
-            query = db.query(TitleBasics).filter(TitleBasics.genres.ilike(f"%{genre}%"))
-            if min_rating:
-                query = query.join(TitleRatings).filter(TitleRatings.averageRating >= min_rating)
-            self.logger.info(f"Buscando títulos do gênero {genre} com avaliação mínima {min_rating}")
-            return query.options(joinedload(TitleBasics.rating)).all()
-
-    def get_top_rated_titles(self, limit: int = 10) -> List[TitleBasics]:
-        with next(get_db()) as db:
-            self.logger.info("Buscando os títulos mais bem avaliados")
-            return (
-                db.query(TitleBasics)
-                .join(TitleRatings)
-                .order_by(TitleRatings.averageRating.desc())
-                .limit(limit)
-                .all()
-            )
-
-    def get_titles_with_crew_and_cast(self, tconst: str) -> Optional[TitleBasics]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando título {tconst} com informações de equipe e elenco")
-            return (
-                db.query(TitleBasics)
-                .filter(TitleBasics.tconst == tconst)
-                .options(joinedload(TitleBasics.crew), joinedload(TitleBasics.principals).joinedload(TitlePrincipals.name))
-                .first()
-            )
-
-    def get_titles_by_director(self, director_name: str) -> List[TitleBasics]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando títulos dirigidos por {director_name}")
-            return (
-                db.query(TitleBasics)
-                .join(TitleCrew)
-                .join(NameBasics, TitleCrew.directors.contains(NameBasics.nconst))
-                .filter(NameBasics.primaryName.ilike(f"%{director_name}%"))
-                .all()
-            )
-
-    def delete(self, tconst: str) -> bool:
-        with next(get_db()) as db:
-            title = db.query(TitleBasics).filter(TitleBasics.tconst == tconst).first()
-            if not title:
-                return False
-            db.delete(title)
-            db.commit()
-            self.logger.info(f"Título {tconst} deletado")
-            return True
+    async def get_by_tconst(self, db: AsyncSession, tconst: str) -> Optional[TitleBasics]:
+        found = await self.get_versioned(db, tconst)
+        return found[0] if found else None
+
+    async def get_versioned(self, db: AsyncSession, tconst: str) -> Optional[Tuple[TitleBasics, str]]:
+        """(título, versão da linha); usado para o ETag."""
+        self.logger.info(f"Buscando título com tconst {tconst}")
+        return await title_cache.get_or_load(tconst, lambda: load_versioned(db, TitleBasics, tconst))
+
+    async def get_version(self, db: AsyncSession, tconst: str) -> Optional[str]:
+        cached = title_cache.peek(tconst)
+        return cached[1] if cached else await current_version(db, TitleBasics, tconst)
+
+    async def get_all(self, db: AsyncSession, page: int = 1, limit: int = 10) -> PaginationResultDto:
+        query = select_columns(TitleBasics)
+        total_items, estimated = await count_provider.total(db, query, "title_basics")
+        number_of_pages = (total_items + limit - 1) // limit
+        data = as_dicts(await db.execute(query.offset((page - 1) * limit).limit(limit)))
+
+        return PaginationResultDto[TitleBasicsDto](
+            page=page,
+            limit=limit,
+            total_items=total_items,
+            number_of_pages=number_of_pages,
+            data=data,
+            total_is_estimated=estimated
+        )
+
+    async def get_all_keyset(self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 10) -> CursorPaginationResultDto:
+        self.logger.info(f"Buscando títulos após o cursor {cursor}")
+        return await keyset_page(db, select_columns(TitleBasics), [TitleBasics.tconst], cursor, limit, TitleBasicsDto)
+
+    async def search_by_title(self, db: AsyncSession, title: str, page: int = 1, limit: int = 10) -> PaginationResultDto:
+        self.logger.info(f"Buscando títulos parecidos com {title}")
+        return await search_page(db, TitleBasics, TitleBasicsDto, title, (TitleBasics.primaryTitle, TitleBasics.originalTitle), page, limit)
+
+    @staticmethod
+    def by_genre_query(genre: str, min_rating: Optional[float] = None) -> Select:
+        query = (
+            select_columns(TitleBasics)
+            .join(TitleGenre, TitleBasics.tconst == TitleGenre.tconst)
+            .where(TitleGenre.genre == genre.strip().lower())
+        )
+        if min_rating:
+            query = query.join(TitleRatings, TitleBasics.tconst == TitleRatings.tconst).where(TitleRatings.averageRating >= min_rating)
+        return query
+
+    async def get_by_genre(self, db: AsyncSession, genre: str, min_rating: Optional[float] = None) -> List[dict]:
+        self.logger.info(f"Buscando títulos do gênero {genre} com avaliação mínima {min_rating}")
+        return as_dicts(await db.execute(self.by_genre_query(genre, min_rating)))
+
+    async def get_top_rated_titles(self, db: AsyncSession, limit: int = 10) -> List[dict]:
+        self.logger.info("Buscando os títulos mais bem avaliados")
+        tconsts = [rating.tconst for rating in await rating_leaderboard.get(db, limit)]
+        rows = as_dicts(await db.execute(select_columns(TitleBasics).where(TitleBasics.tconst.in_(tconsts))))
+        titles = {title["tconst"]: title for title in rows}
+        return [titles[tconst] for tconst in tconsts if tconst in titles]
+
+    async def get_titles_with_crew_and_cast(self, db: AsyncSession, tconst: str) -> Optional[TitleBasics]:
+        self.logger.info(f"Buscando título {tconst} com informações de equipe e elenco")
+        result = await db.scalars(
+            select(TitleBasics)
+            .where(TitleBasics.tconst == tconst)
+            .options(joinedload(TitleBasics.crew), joinedload(TitleBasics.principals).joinedload(TitlePrincipals.name))
+        )
+        return result.unique().first()
+
+    @staticmethod
+    def by_director_query(director_name: str) -> Select:
+        return (
+            select_columns(TitleBasics)
+            .join(TitleCrewMember, TitleBasics.tconst == TitleCrewMember.tconst)
+            .join(NameBasics, TitleCrewMember.nconst == NameBasics.nconst)
+            .where(TitleCrewMember.role == "director", contains(NameBasics.primaryName, director_name))
+            .distinct()
+        )
+
+    async def get_titles_by_director(self, db: AsyncSession, director_name: str) -> List[dict]:
+        self.logger.info(f"Buscando títulos dirigidos por {director_name}")
+        return as_dicts(await db.execute(self.by_director_query(director_name)))
+
+    async def delete(self, db: AsyncSession, tconst: str) -> bool:
+        title = await db.get(TitleBasics, tconst)
+        if not title:
+            return False
+        await db.delete(title)
+        await db.flush()
+        on_commit(db, lambda: count_provider.invalidate("title_basics"))
+        on_commit(db, lambda: title_cache.invalidate(tconst))
+        # Avaliação, equipe e elenco do título saem junto com ele pelo ON DELETE CASCADE
+        for table in ("title_ratings", "title_crew", "title_principals"):
+            on_commit(db, lambda table=table: count_provider.invalidate(table))
+        on_commit(db, lambda: rating_cache.invalidate(tconst))
+        on_commit(db, lambda: remove_from_leaderboards(tconst))
+        on_commit(db, rating_stats_refresher.schedule)
+        self.logger.info(f"Título {tconst} deletado")
+        return True
 
     
-    def get_titles_by_genre_and_rating_with_cast(self,
+    async def get_titles_by_genre_and_rating_with_cast(self, db: AsyncSession,
         genre: str, min_rating: float
     ) -> List[TitleBasics]:
-        with next(get_db()) as db:
-            query = (
-                db.query(TitleBasics)
-                .join(TitleRatings, TitleBasics.tconst == TitleRatings.tconst)
-                .join(TitlePrincipals, TitleBasics.tconst == TitlePrincipals.tconst)
-                .join(NameBasics, TitlePrincipals.nconst == NameBasics.nconst)
-                .filter(TitleBasics.genres.ilike(f"%{genre}%"))
-                .filter(TitleRatings.averageRating >= min_rating)
-                .options(
-                    joinedload(TitleBasics.rating),  
-                    joinedload(TitleBasics.principals).joinedload(
-                        TitlePrincipals.name
-                    ),  
-                )
+        query = (
+            select(TitleBasics)
+            .join(TitleGenre, TitleBasics.tconst == TitleGenre.tconst)
+            .join(TitleRatings, TitleBasics.tconst == TitleRatings.tconst)
+            .join(TitlePrincipals, TitleBasics.tconst == TitlePrincipals.tconst)
+            .join(NameBasics, TitlePrincipals.nconst == NameBasics.nconst)
+            .where(TitleGenre.genre == genre.strip().lower())
+            .where(TitleRatings.averageRating >= min_rating)
+            .options(
+                joinedload(TitleBasics.rating),  
+                joinedload(TitleBasics.principals).joinedload(
+                    TitlePrincipals.name
+                ),  
             )
+        )
             
-            titles = query.all()
-            return titles
-
-    def get_titles_by_date_range(self, start_year: int, end_year: int) -> List[TitleBasics]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando títulos lançados entre {start_year} e {end_year}")
-            return (
-                db.query(TitleBasics)
-                .filter(TitleBasics.startYear >= start_year, TitleBasics.startYear <= end_year)
-                .all()
-            )
\ No newline at end of file
+        titles = (await db.scalars(query)).unique().all()
+        return titles
+
+    @staticmethod
+    def by_date_range_query(start_year: int, end_year: int) -> Select:
+        return select_columns(TitleBasics).where(TitleBasics.startYear >= start_year, TitleBasics.startYear <= end_year)
+
+    async def get_titles_by_date_range(self, db: AsyncSession, start_year: int, end_year: int) -> List[dict]:
+        self.logger.info(f"Buscando títulos lançados entre {start_year} e {end_year}")
+        return as_dicts(await db.execute(self.by_date_range_query(start_year, end_year)))
@@ -1,82 +1,94 @@
 import logging
-from typing import Optional,List
+from typing import Optional
+from src.app.core.pagination import keyset_page
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
+from src.app.dtos.TitleCrewDto import TitleCrewDto
+from sqlalchemy import delete
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
-from src.app.core.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.app.core.db.counts import count_provider
+from src.app.core.db.database import on_commit
+from src.app.core.db.rating_stats import rating_stats_refresher
+from src.app.core.db.rows import as_dicts, select_columns
 #models
 from src.app.models.title_crew import TitleCrew
-from src.app.models.title_basics import TitleBasics
-from src.app.models.title_ratings import TitleRatings
-from src.app.models.title_principals import TitlePrincipals
-from src.app.models.name_basics import NameBasics
+from src.app.models.title_crew_member import TitleCrewMember, crew_members
 
 
 class TitleCrewRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def create(self, title_crew: TitleCrew) -> TitleCrew:
+    async def create(self, db: AsyncSession, title_crew: TitleCrew) -> TitleCrew:
         try:
-            with next(get_db()) as db:
-                db.add(title_crew)
-                db.commit()
-                db.refresh(title_crew)
-                self.logger.info(f"TitleCrew criado com sucesso! tconst: {title_crew.tconst}")
-                return title_crew
+            db.add(title_crew)
+            await db.flush()
+            db.add_all(crew_members(title_crew.tconst, title_crew.directors, title_crew.writers))
+            await db.flush()
+            on_commit(db, lambda: count_provider.invalidate("title_crew"))
+            on_commit(db, rating_stats_refresher.schedule)
+            self.logger.info(f"TitleCrew criado com sucesso! tconst: {title_crew.tconst}")
+            return title_crew
         except IntegrityError:
             self.logger.error(f"Erro ao criar TitleCrew! tconst: {title_crew.tconst}")
             raise ValueError(f"Erro ao criar TitleCrew com tconst: {title_crew.tconst}")
 
-    def get_by_tconst(self, tconst: str) -> Optional[TitleCrew]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando TitleCrew com tconst {tconst}")
-            return db.query(TitleCrew).filter(TitleCrew.tconst == tconst).first()
+    async def get_by_tconst(self, db: AsyncSession, tconst: str) -> Optional[TitleCrew]:
+        self.logger.info(f"Buscando TitleCrew com tconst {tconst}")
+        return await db.get(TitleCrew, tconst)
 
-    def update(self, tconst: str, title_crew: TitleCrew) -> Optional[TitleCrew]:
+    async def update(self, db: AsyncSession, tconst: str, title_crew: TitleCrew) -> Optional[TitleCrew]:
         try:
-            with next(get_db()) as db:
-                existing_title_crew = db.query(TitleCrew).filter(TitleCrew.tconst == tconst).first()
-                if not existing_title_crew:
-                    self.logger.warning(f"TitleCrew com tconst {tconst} não encontrado para atualização.")
-                    return None
+            existing_title_crew = await db.get(TitleCrew, tconst)
+            if not existing_title_crew:
+                self.logger.warning(f"TitleCrew com tconst {tconst} não encontrado para atualização.")
+                return None
 
-                # Update fields
-                existing_title_crew.directors = title_crew.directors
-                existing_title_crew.writers = title_crew.writers
+            # Update fields
+            existing_title_crew.directors = title_crew.directors
+            existing_title_crew.writers = title_crew.writers
 
-                db.commit()
-                db.refresh(existing_title_crew)
-                self.logger.info(f"TitleCrew com tconst {tconst} atualizado com sucesso!")
-                return existing_title_crew
+            # Recria os membros normalizados a partir das novas listas
+            await db.execute(delete(TitleCrewMember).where(TitleCrewMember.tconst == tconst))
+            db.add_all(crew_members(tconst, title_crew.directors, title_crew.writers))
+
+            await db.flush()
+            on_commit(db, lambda: count_provider.invalidate("title_crew"))
+            on_commit(db, rating_stats_refresher.schedule)
+            self.logger.info(f"TitleCrew com tconst {tconst} atualizado com sucesso!")
+            return existing_title_crew
         except IntegrityError as e:
-            db.rollback()
             self.logger.error(f"Erro ao atualizar TitleCrew com tconst {tconst}: {e}")
             raise ValueError(f"Erro ao atualizar TitleCrew com tconst: {tconst}")
 
-    def delete(self, tconst: str) -> bool:
-        with next(get_db()) as db:
-            title_crew = db.query(TitleCrew).filter(TitleCrew.tconst == tconst).first()
-            if not title_crew:
-                self.logger.warning(f"TitleCrew com tconst {tconst} não encontrado para deleção.")
-                return False
-            db.delete(title_crew)
-            db.commit()
-            self.logger.info(f"TitleCrew com tconst {tconst} deletado")
-            return True
+    async def delete(self, db: AsyncSession, tconst: str) -> bool:
+        title_crew = await db.get(TitleCrew, tconst)
+        if not title_crew:
+            self.logger.warning(f"TitleCrew com tconst {tconst} não encontrado para deleção.")
+            return False
+        await db.delete(title_crew)
+        await db.flush()
+        on_commit(db, lambda: count_provider.invalidate("title_crew"))
+        on_commit(db, rating_stats_refresher.schedule)
+        self.logger.info(f"TitleCrew com tconst {tconst} deletado")
+        return True
     
-    def get_all(self, page: int = 1, limit: int = 10) -> PaginationResultDto:
-        with next(get_db()) as db:
-            query = db.query(TitleCrew)
-            total_items = query.count()
-            number_of_pages = (total_items + limit - 1) // limit
-            data = query.offset((page - 1) * limit).limit(limit).all()
+    async def get_all(self, db: AsyncSession, page: int = 1, limit: int = 10) -> PaginationResultDto:
+        query = select_columns(TitleCrew)
+        total_items, estimated = await count_provider.total(db, query, "title_crew")
+        number_of_pages = (total_items + limit - 1) // limit
+        data = as_dicts(await db.execute(query.offset((page - 1) * limit).limit(limit)))
+
+        return PaginationResultDto[TitleCrewDto](
+            page=page,
+            limit=limit,
+            total_items=total_items,
+            number_of_pages=number_of_pages,
+            data=data,
+            total_is_estimated=estimated
+        )
 
-            return PaginationResultDto(
-                page=page,
-                limit=limit,
-                total_items=total_items,
-                number_of_pages=number_of_pages,
-                data=data
-            )
-            
\ No newline at end of file
+    async def get_all_keyset(self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 10) -> CursorPaginationResultDto:
+        self.logger.info(f"Buscando equipes após o cursor {cursor}")
+        return await keyset_page(db, select_columns(TitleCrew), [TitleCrew.tconst], cursor, limit, TitleCrewDto)
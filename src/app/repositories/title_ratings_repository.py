@@ -1,13 +1,24 @@
 import logging
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Select, and_, select
 from sqlalchemy.exc import IntegrityError
-
-from src.app.core.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.cache import rating_cache
+from src.app.core.db.counts import count_provider
+from src.app.core.leaderboard import rating_leaderboard, remove_from_leaderboards, update_leaderboards, votes_leaderboard
+from src.app.core.db.database import on_commit
+from src.app.core.db.rows import as_dicts, select_columns
+from src.app.core.db.versions import current_version, load_versioned
+from src.app.core.db.rating_stats import DIMENSIONS, rating_stats, rating_stats_refresher
+from src.app.core.db.search import contains
+from src.app.core.pagination import keyset_page
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
-from src.app.models.title_basics import TitleBasics
-from src.app.models.title_crew import TitleCrew
+from src.app.dtos.RatingStatsDto import RatingStatsDto
+from src.app.dtos.TitleRatingsDto import TitleRatingsDto
+from src.app.models.name_basics import NameBasics
 from src.app.models.title_ratings import TitleRatings
 
 
@@ -15,117 +26,156 @@ class TitleRatingsRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def create(self, rating: TitleRatings) -> TitleRatings:
+    async def create(self, db: AsyncSession, rating: TitleRatings) -> TitleRatings:
         try:
-            with next(get_db()) as db:
-                db.add(rating)
-                db.commit()
-                db.refresh(rating)
-                self.logger.info(f"Avaliação do título {rating.tconst} criada com sucesso!")
-                return rating
+            db.add(rating)
+            await db.flush()
+            on_commit(db, lambda: count_provider.invalidate("title_ratings"))
+            on_commit(db, lambda: rating_cache.invalidate(rating.tconst))
+            on_commit(db, lambda: update_leaderboards(rating))
+            on_commit(db, rating_stats_refresher.schedule)
+            self.logger.info(f"Avaliação do título {rating.tconst} criada com sucesso!")
+            return rating
         except IntegrityError:
             self.logger.error(f"Erro ao criar avaliação para o título {rating.tconst}!")
             raise ValueError(f"Erro ao criar avaliação para o título {rating.tconst}!")
 
-    def get_by_tconst(self, tconst: str) -> Optional[TitleRatings]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando avaliação do título com tconst {tconst}")
-            return db.query(TitleRatings).filter(TitleRatings.tconst == tconst).first()
-
-    def update(self, tconst: str, averageRating: float, numVotes: int) -> Optional[TitleRatings]:
-        with next(get_db()) as db:
-            rating = db.query(TitleRatings).filter(TitleRatings.tconst == tconst).first()
-            if rating:
-                rating.averageRating = averageRating
-                rating.numVotes = numVotes
-                db.commit()
-                db.refresh(rating)
-                self.logger.info(f"Avaliação do título {tconst} atualizada com sucesso!")
-                return rating
-            else:
-                self.logger.warning(f"Avaliação do título {tconst} não encontrada para atualização.")
-                return None
-            
-    def get_all(self) -> List[TitleRatings]:
-        with next(get_db()) as db:
-            self.logger.info("Buscando todas as avaliações de títulos")
-            return db.query(TitleRatings).all()
-
-    def delete(self, tconst: str) -> bool:
-        with next(get_db()) as db:
-            rating = db.query(TitleRatings).filter(TitleRatings.tconst == tconst).first()
-            if rating:
-                db.delete(rating)
-                db.commit()
-                self.logger.info(f"Avaliação do título {tconst} deletada com sucesso!")
-                return True
-            else:
-                self.logger.warning(f"Avaliação do título {tconst} não encontrada para exclusão.")
-                return False
-
-    def get_ratings_above(self, min_rating: float, page: int = 1, limit: int = 10) -> PaginationResultDto:
-        with next(get_db()) as db:
-            query = db.query(TitleRatings).filter(TitleRatings.averageRating >= min_rating)
-            total_items = query.count()
-            number_of_pages = (total_items + limit - 1) // limit
-            data = query.offset((page - 1) * limit).limit(limit).all()
-
-            self.logger.info(f"Buscando avaliações acima de {min_rating}, página {page}, limite {limit}.")
-
-            return PaginationResultDto(
-                page=page,
-                limit=limit,
-                total_items=total_items,
-                number_of_pages=number_of_pages,
-                data=data
-            )
-
-    def get_ratings_by_votes(self, min_votes: int, page: int = 1, limit: int = 10) -> PaginationResultDto:
-         with next(get_db()) as db:
-            query = db.query(TitleRatings).filter(TitleRatings.numVotes >= min_votes)
-            total_items = query.count()
-            number_of_pages = (total_items + limit - 1) // limit
-            data = query.offset((page - 1) * limit).limit(limit).all()
-
-            self.logger.info(f"Buscando avaliações com no mínimo {min_votes} votos, página {page}, limite {limit}.")
-
-            return PaginationResultDto(
-                page=page,
-                limit=limit,
-                total_items=total_items,
-                number_of_pages=number_of_pages,
-                data=data
-            )
-
-    def get_top_n_voted(self, n: int = 10) -> List[TitleRatings]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando os {n} títulos mais votados")
-            return (
-                db.query(TitleRatings)
-                .order_by(TitleRatings.numVotes.desc())
-                .limit(n)
-                .all()
-            )
-
-    def get_highest_rated(self, n: int = 10) -> List[TitleRatings]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando os {n} títulos com melhor avaliação")
-            return (
-                db.query(TitleRatings)
-                .order_by(TitleRatings.averageRating.desc())
-                .limit(n)
-                .all()
-            )
+    async def get_by_tconst(self, db: AsyncSession, tconst: str) -> Optional[TitleRatings]:
+        found = await self.get_versioned(db, tconst)
+        return found[0] if found else None
+
+    async def get_versioned(self, db: AsyncSession, tconst: str) -> Optional[Tuple[TitleRatings, str]]:
+        """(avaliação, versão da linha); usado para o ETag."""
+        self.logger.info(f"Buscando avaliação do título com tconst {tconst}")
+        return await rating_cache.get_or_load(tconst, lambda: load_versioned(db, TitleRatings, tconst))
+
+    async def get_version(self, db: AsyncSession, tconst: str) -> Optional[str]:
+        cached = rating_cache.peek(tconst)
+        return cached[1] if cached else await current_version(db, TitleRatings, tconst)
+
+    async def update(self, db: AsyncSession, tconst: str, averageRating: float, numVotes: int) -> Optional[TitleRatings]:
+        rating = await db.get(TitleRatings, tconst)
+        if rating:
+            rating.averageRating = averageRating
+            rating.numVotes = numVotes
+            await db.flush()
+            on_commit(db, lambda: count_provider.invalidate("title_ratings"))
+            on_commit(db, lambda: rating_cache.invalidate(tconst))
+            on_commit(db, lambda: update_leaderboards(rating))
+            on_commit(db, rating_stats_refresher.schedule)
+            self.logger.info(f"Avaliação do título {tconst} atualizada com sucesso!")
+            return rating
+        else:
+            self.logger.warning(f"Avaliação do título {tconst} não encontrada para atualização.")
+            return None
             
-    def get_average_rating_by_title_type(self, title_type: str) -> List[TitleRatings]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando avaliação média dos títulos do tipo {title_type}")
-            return db.query(TitleRatings).join(TitleRatings.title).filter(TitleBasics.titleType == title_type).all()  
-        
-    def get_average_rating_by_director (self, director_name: str) -> List[TitleRatings]:
-        with next(get_db()) as db:
-            self.logger.info(f"Buscando avaliação média dos títulos dirigidos por {director_name}")
-            return db.query(TitleRatings).join(TitleRatings.title).join(TitleBasics.crew).filter(TitleCrew.directors == director_name).all()
-          
-        
-    
\ No newline at end of file
+    @staticmethod
+    def all_query() -> Select:
+        return select_columns(TitleRatings)
+
+    async def get_all(self, db: AsyncSession) -> List[dict]:
+        self.logger.info("Buscando todas as avaliações de títulos")
+        return as_dicts(await db.execute(self.all_query()))
+
+    async def get_all_keyset(self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 10) -> CursorPaginationResultDto:
+        self.logger.info(f"Buscando avaliações após o cursor {cursor}")
+        return await keyset_page(db, select_columns(TitleRatings), [TitleRatings.tconst], cursor, limit, TitleRatingsDto)
+
+    async def delete(self, db: AsyncSession, tconst: str) -> bool:
+        rating = await db.get(TitleRatings, tconst)
+        if rating:
+            await db.delete(rating)
+            await db.flush()
+            on_commit(db, lambda: count_provider.invalidate("title_ratings"))
+            on_commit(db, lambda: rating_cache.invalidate(tconst))
+            on_commit(db, lambda: remove_from_leaderboards(tconst))
+            on_commit(db, rating_stats_refresher.schedule)
+            self.logger.info(f"Avaliação do título {tconst} deletada com sucesso!")
+            return True
+        else:
+            self.logger.warning(f"Avaliação do título {tconst} não encontrada para exclusão.")
+            return False
+
+    async def get_ratings_above(self, db: AsyncSession, min_rating: float, page: int = 1, limit: int = 10) -> PaginationResultDto:
+        query = select_columns(TitleRatings).where(TitleRatings.averageRating >= min_rating)
+        total_items, estimated = await count_provider.total(db, query, "title_ratings", ("above", min_rating))
+        number_of_pages = (total_items + limit - 1) // limit
+        data = as_dicts(await db.execute(query.offset((page - 1) * limit).limit(limit)))
+
+        self.logger.info(f"Buscando avaliações acima de {min_rating}, página {page}, limite {limit}.")
+
+        return PaginationResultDto[TitleRatingsDto](
+            page=page,
+            limit=limit,
+            total_items=total_items,
+            number_of_pages=number_of_pages,
+            data=data,
+            total_is_estimated=estimated
+        )
+
+    async def get_ratings_by_votes(self, db: AsyncSession, min_votes: int, page: int = 1, limit: int = 10) -> PaginationResultDto:
+        query = select_columns(TitleRatings).where(TitleRatings.numVotes >= min_votes)
+        total_items, estimated = await count_provider.total(db, query, "title_ratings", ("by_votes", min_votes))
+        number_of_pages = (total_items + limit - 1) // limit
+        data = as_dicts(await db.execute(query.offset((page - 1) * limit).limit(limit)))
+
+        self.logger.info(f"Buscando avaliações com no mínimo {min_votes} votos, página {page}, limite {limit}.")
+
+        return PaginationResultDto[TitleRatingsDto](
+            page=page,
+            limit=limit,
+            total_items=total_items,
+            number_of_pages=number_of_pages,
+            data=data,
+            total_is_estimated=estimated
+        )
+
+    async def get_ratings_above_keyset(self, db: AsyncSession, min_rating: float, cursor: Optional[str] = None, limit: int = 10) -> CursorPaginationResultDto:
+        self.logger.info(f"Buscando avaliações acima de {min_rating} após o cursor {cursor}")
+        query = select_columns(TitleRatings).where(TitleRatings.averageRating >= min_rating)
+        return await keyset_page(db, query, [TitleRatings.averageRating, TitleRatings.tconst], cursor, limit, TitleRatingsDto)
+
+    async def get_ratings_by_votes_keyset(self, db: AsyncSession, min_votes: int, cursor: Optional[str] = None, limit: int = 10) -> CursorPaginationResultDto:
+        self.logger.info(f"Buscando avaliações com no mínimo {min_votes} votos após o cursor {cursor}")
+        query = select_columns(TitleRatings).where(TitleRatings.numVotes >= min_votes)
+        return await keyset_page(db, query, [TitleRatings.numVotes, TitleRatings.tconst], cursor, limit, TitleRatingsDto)
+
+    async def get_top_n_voted(self, db: AsyncSession, n: int = 10) -> List[TitleRatings]:
+        self.logger.info(f"Buscando os {n} títulos mais votados")
+        return await votes_leaderboard.get(db, n)
+
+    async def get_highest_rated(self, db: AsyncSession, n: int = 10) -> List[TitleRatings]:
+        self.logger.info(f"Buscando os {n} títulos com melhor avaliação")
+        return await rating_leaderboard.get(db, n)
+
+    async def get_rating_stats(self, db: AsyncSession, dimension: str, limit: int = 100) -> List[RatingStatsDto]:
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Dimensão inválida: {dimension}. Use uma de: {', '.join(DIMENSIONS)}")
+        self.logger.info(f"Buscando estatísticas de avaliação por {dimension}")
+        query = self._stats_query().where(rating_stats.c.dimension == dimension)
+        query = query.order_by(rating_stats.c.count.desc(), rating_stats.c.key).limit(limit)
+        return [RatingStatsDto(**row) for row in (await db.execute(query)).mappings()]
+
+    async def get_average_rating_by_title_type(self, db: AsyncSession, title_type: str) -> Optional[RatingStatsDto]:
+        self.logger.info(f"Buscando avaliação média dos títulos do tipo {title_type}")
+        query = self._stats_query().where(
+            rating_stats.c.dimension == "title_type", rating_stats.c.key == title_type
+        )
+        row = (await db.execute(query)).mappings().first()
+        return RatingStatsDto(**row) if row else None
+
+    async def get_average_rating_by_director(self, db: AsyncSession, director_name: str) -> List[RatingStatsDto]:
+        self.logger.info(f"Buscando avaliação média dos títulos dirigidos por {director_name}")
+        query = (
+            self._stats_query()
+            .where(rating_stats.c.dimension == "director", contains(NameBasics.primaryName, director_name))
+            .order_by(rating_stats.c.count.desc(), rating_stats.c.key)
+        )
+        return [RatingStatsDto(**row) for row in (await db.execute(query)).mappings()]
+
+    @staticmethod
+    def _stats_query():
+        # Estatísticas pré-calculadas na view materializada; o nome só existe para a dimensão director
+        return select(rating_stats, NameBasics.primaryName.label("name")).outerjoin(
+            NameBasics, and_(rating_stats.c.dimension == "director", NameBasics.nconst == rating_stats.c.key)
+        )
@@ -0,0 +1,24 @@
+from typing import Dict
+
+from fastapi import APIRouter
+
+from src.app.core.cache import entity_caches
+from src.app.core.db.database import async_engine, engine
+from src.app.dtos.CacheStatsDto import CacheStatsDto
+from src.app.dtos.PoolStatsDto import PoolMetricsDto
+
+metrics_router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@metrics_router.get("/pool", response_model=PoolMetricsDto)
+async def get_pool_metrics():
+    # api: engine assíncrona das rotas; sync: engine da carga e das tarefas em segundo plano
+    return PoolMetricsDto(
+        api=async_engine.pool.metrics.snapshot(async_engine.pool),
+        sync=engine.pool.metrics.snapshot(engine.pool),
+    )
+
+
+@metrics_router.get("/cache", response_model=Dict[str, CacheStatsDto])
+async def get_cache_metrics():
+    return {name: cache.stats() for name, cache in entity_caches.items()}
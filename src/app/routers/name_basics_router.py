@@ -1,9 +1,13 @@
 from typing import Optional,List
-from fastapi import APIRouter, HTTPException, status, Query, Path
+from fastapi import APIRouter, HTTPException, status, Query, Path, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.database import get_async_db
+from src.app.core.etag import conditional_get, list_cache_control
 from src.app.dtos.TitleBasicWithCastDto import TitleBasicsWithCast
-from src.app.models.title_basics import TitleBasics
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
-from src.app.repositories.title_basics_repository import TitleBasicsRepository
+from src.app.dtos.NameBasicsDto import NameBasicsDto
 from src.app.repositories.name_basics_repository import NameBasicsRepository
 from src.app.models.name_basics import NameBasics
 
@@ -11,41 +15,65 @@ name_basics_router = APIRouter(prefix="/name-basics", tags=["Name Basics"])
 
 name_basics_repository = NameBasicsRepository()
 
-@name_basics_router.post("/", response_model=TitleBasics, status_code=status.HTTP_201_CREATED)
-def create_name(name: NameBasics):
+@name_basics_router.post("/", response_model=NameBasicsDto, status_code=status.HTTP_201_CREATED)
+async def create_name(name: NameBasics, db: AsyncSession = Depends(get_async_db)):
     try:
-        return name_basics_repository.create(name)
+        return await name_basics_repository.create(db, name)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-@name_basics_router.get("/{nconst}", response_model=Optional[NameBasics])
-def get_name_by_id(nconst: str = Path(..., title="The ID of the name to get")):
-    name = name_basics_repository.get_by_nconst(nconst)
+@name_basics_router.get("/search", response_model=PaginationResultDto[NameBasicsDto], dependencies=[Depends(list_cache_control)])
+async def search_names(
+    name: str = Query(..., title="The name to search for"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await name_basics_repository.search_by_name(db, name, page, limit)
+
+
+@name_basics_router.get("/keyset/", response_model=CursorPaginationResultDto[NameBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_names_keyset(
+    cursor: Optional[str] = Query(None, title="next_cursor returned by the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await name_basics_repository.get_all_keyset(db, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@name_basics_router.get("/{nconst}", response_model=Optional[NameBasicsDto])
+async def get_name_by_id(
+    request: Request,
+    response: Response,
+    nconst: str = Path(..., title="The ID of the name to get"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    name = await conditional_get(
+        request,
+        response,
+        lambda: name_basics_repository.get_version(db, nconst),
+        lambda: name_basics_repository.get_versioned(db, nconst),
+    )
     if not name:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Nome não encontrado"
         )
     return name
     
-@name_basics_router.get("/", response_model=PaginationResultDto)
-def get_names(
-    page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1, le=100),
-):
-    return name_basics_repository.get_all(page, limit)
-
-@name_basics_router.get("/search", response_model=PaginationResultDto)
-def search_names(
-    name: str = Query(..., title="The name to search for"),
+@name_basics_router.get("/", response_model=PaginationResultDto[NameBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_names(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return name_basics_repository.search_by_name(name, page, limit)
-
+    return await name_basics_repository.get_all(db, page, limit)
 
-@name_basics_router.get("/{nconst}/titles", response_model=List[TitleBasicsWithCast])
-def get_known_for_titles(nconst: str = Path(..., title="The ID of the name to get")):
-    titles = name_basics_repository.get_known_for_titles(nconst)
+@name_basics_router.get("/{nconst}/titles", response_model=List[TitleBasicsWithCast], dependencies=[Depends(list_cache_control)])
+async def get_known_for_titles(nconst: str = Path(..., title="The ID of the name to get"), db: AsyncSession = Depends(get_async_db)):
+    titles = await name_basics_repository.get_known_for_titles(db, nconst)
     if not titles:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Títulos não encontrados"
@@ -53,8 +81,8 @@ def get_known_for_titles(nconst: str = Path(..., title="The ID of the name to ge
     return titles
 
 @name_basics_router.get("/{nconst}/titles/{tconst}", response_model=Optional[TitleBasicsWithCast])
-def get_title_by_id(nconst: str = Path(..., title="The ID of the name to get"), tconst: str = Path(..., title="The ID of the title to get")):
-    title = name_basics_repository.get_title_by_id(nconst, tconst)
+async def get_title_by_id(nconst: str = Path(..., title="The ID of the name to get"), tconst: str = Path(..., title="The ID of the title to get"), db: AsyncSession = Depends(get_async_db)):
+    title = await name_basics_repository.get_title_by_id(db, nconst, tconst)
     if not title:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Título não encontrado"
@@ -63,9 +91,9 @@ def get_title_by_id(nconst: str = Path(..., title="The ID of the name to get"),
 
 
 # restante:  get_professions
-@name_basics_router.get("/{nconst}/professions", response_model=List[str])
-def get_professions(nconst: str = Path(..., title="The ID of the name to get")):
-    professions = name_basics_repository.get_professions(nconst)
+@name_basics_router.get("/{nconst}/professions", response_model=List[str], dependencies=[Depends(list_cache_control)])
+async def get_professions(nconst: str = Path(..., title="The ID of the name to get"), db: AsyncSession = Depends(get_async_db)):
+    professions = await name_basics_repository.get_professions(db, nconst)
     if not professions:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Profissões não encontradas"
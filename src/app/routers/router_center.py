@@ -4,6 +4,7 @@ from src.app.routers.title_crew_router import title_crew_router
 from src.app.routers.name_basics_router import name_basics_router
 from src.app.routers.title_principals_router import title_principals_router
 from src.app.routers.title_ratings_router import title_ratings_router
+from src.app.routers.metrics_router import metrics_router
 
 router = APIRouter()
 
@@ -12,3 +13,4 @@ router.include_router(title_crew_router)
 router.include_router(name_basics_router)
 router.include_router(title_principals_router)
 router.include_router(title_ratings_router)
+router.include_router(metrics_router)
@@ -1,8 +1,15 @@
 from typing import Optional,List
-from fastapi import APIRouter, HTTPException, status, Query, Path
+from fastapi import APIRouter, HTTPException, status, Query, Path, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.database import get_async_db
+from src.app.core.etag import conditional_get, list_cache_control
+from src.app.core.streaming import ResponseFormat, stream_response
 from src.app.dtos.TitleBasicWithCastDto import TitleBasicsWithCast
 from src.app.models.title_basics import TitleBasics
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
+from src.app.dtos.TitleBasicsDto import TitleBasicsDto
 from src.app.repositories.title_basics_repository import TitleBasicsRepository
 
 title_basics_router = APIRouter(prefix="/api/titles", tags=["Title Basics"])
@@ -10,47 +17,76 @@ title_basics_router = APIRouter(prefix="/api/titles", tags=["Title Basics"])
 title_basics_repository = TitleBasicsRepository()
 
 
-@title_basics_router.post("/", response_model=TitleBasics, status_code=status.HTTP_201_CREATED)
-def create_title(title: TitleBasics):
+@title_basics_router.post("/", response_model=TitleBasicsDto, status_code=status.HTTP_201_CREATED)
+async def create_title(title: TitleBasics, db: AsyncSession = Depends(get_async_db)):
     try:
-        return title_basics_repository.create(title)
+        return await title_basics_repository.create(db, title)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@title_basics_router.get("/", response_model=PaginationResultDto)
-def get_titles(
+@title_basics_router.get("/", response_model=PaginationResultDto[TitleBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_titles(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_basics_repository.get_all(page, limit)
+    return await title_basics_repository.get_all(db, page, limit)
 
 
-@title_basics_router.get("/search", response_model=PaginationResultDto)
-def search_titles(
+@title_basics_router.get("/search", response_model=PaginationResultDto[TitleBasicsDto], dependencies=[Depends(list_cache_control)])
+async def search_titles(
     title: str = Query(..., title="The title to search for"),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_basics_repository.search_by_title(title, page, limit)
+    return await title_basics_repository.search_by_title(db, title, page, limit)
 
 
-@title_basics_router.get("/by-genre/")
-def get_titles_by_genre(
+@title_basics_router.get("/by-genre/", response_model=List[TitleBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_titles_by_genre(
     genre: str = Query(..., title="Genre to filter by"),
     min_rating: Optional[float] = Query(None, ge=0, le=10),
+    response_format: ResponseFormat = Query(ResponseFormat.JSON, alias="format", title="json, ndjson or csv"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_basics_repository.get_by_genre(genre, min_rating)
+    if response_format != ResponseFormat.JSON:
+        query = title_basics_repository.by_genre_query(genre, min_rating)
+        return stream_response(query, response_format, f"títulos do gênero {genre}")
+    return await title_basics_repository.get_by_genre(db, genre, min_rating)
+
+
+@title_basics_router.get("/top-rated/", response_model=List[TitleBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_top_rated_titles(limit: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_async_db)):
+    return await title_basics_repository.get_top_rated_titles(db, limit)
 
 
-@title_basics_router.get("/top-rated/")
-def get_top_rated_titles(limit: int = Query(10, ge=1, le=100)):
-    return title_basics_repository.get_top_rated_titles(limit)
+@title_basics_router.get("/keyset/", response_model=CursorPaginationResultDto[TitleBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_titles_keyset(
+    cursor: Optional[str] = Query(None, title="next_cursor returned by the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await title_basics_repository.get_all_keyset(db, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@title_basics_router.get("/{tconst}", response_model=Optional[TitleBasics])
-def get_title_by_id(tconst: str = Path(..., title="The ID of the title to get")):
-    title = title_basics_repository.get_by_tconst(tconst)
+@title_basics_router.get("/{tconst}", response_model=Optional[TitleBasicsDto])
+async def get_title_by_id(
+    request: Request,
+    response: Response,
+    tconst: str = Path(..., title="The ID of the title to get"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    title = await conditional_get(
+        request,
+        response,
+        lambda: title_basics_repository.get_version(db, tconst),
+        lambda: title_basics_repository.get_versioned(db, tconst),
+    )
     if not title:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Título não encontrado"
@@ -59,8 +95,8 @@ def get_title_by_id(tconst: str = Path(..., title="The ID of the title to get"))
 
 
 @title_basics_router.get("/crew-cast/{tconst}", response_model=Optional[TitleBasics])
-def get_title_with_crew_and_cast(tconst: str = Path(..., title="Title ID")):
-    title = title_basics_repository.get_titles_with_crew_and_cast(tconst)
+async def get_title_with_crew_and_cast(tconst: str = Path(..., title="Title ID"), db: AsyncSession = Depends(get_async_db)):
+    title = await title_basics_repository.get_titles_with_crew_and_cast(db, tconst)
     if not title:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Título não encontrado"
@@ -68,14 +104,21 @@ def get_title_with_crew_and_cast(tconst: str = Path(..., title="Title ID")):
     return title
 
 
-@title_basics_router.get("/by-director/{director_name}")
-def get_titles_by_director(director_name: str = Path(..., title="The director's name")):
-    return title_basics_repository.get_titles_by_director(director_name)
+@title_basics_router.get("/by-director/{director_name}", response_model=List[TitleBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_titles_by_director(
+    director_name: str = Path(..., title="The director's name"),
+    response_format: ResponseFormat = Query(ResponseFormat.JSON, alias="format", title="json, ndjson or csv"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if response_format != ResponseFormat.JSON:
+        query = title_basics_repository.by_director_query(director_name)
+        return stream_response(query, response_format, f"títulos dirigidos por {director_name}")
+    return await title_basics_repository.get_titles_by_director(db, director_name)
 
 
 @title_basics_router.delete("/{tconst}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_title(tconst: str):
-    deleted = title_basics_repository.delete(tconst)
+async def delete_title(tconst: str, db: AsyncSession = Depends(get_async_db)):
+    deleted = await title_basics_repository.delete(db, tconst)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Título não encontrado"
@@ -84,18 +127,25 @@ def delete_title(tconst: str):
 
 @title_basics_router.get(
     "/by-genre-rating-cast/",
-    response_model=List[TitleBasicsWithCast]
+    response_model=List[TitleBasicsWithCast],
+    dependencies=[Depends(list_cache_control)]
 )
-def get_titles_by_genre_rating_cast(
-    genre: str = Query("Reality_TV", title="Genre to filter by"),
+async def get_titles_by_genre_rating_cast(
+    genre: str = Query("Reality-TV", title="Genre to filter by"),
     min_rating: float = Query(..., title="Minimum rating"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    titles = title_basics_repository.get_titles_by_genre_and_rating_with_cast(genre, min_rating)
+    titles = await title_basics_repository.get_titles_by_genre_and_rating_with_cast(db, genre, min_rating)
     return titles
 
-@title_basics_router.get("/by-date-range/")
-def get_titles_by_date_range(
+@title_basics_router.get("/by-date-range/", response_model=List[TitleBasicsDto], dependencies=[Depends(list_cache_control)])
+async def get_titles_by_date_range(
     start_year: int = Query(..., title="Start year"),
-    end_year: int = Query(..., title="End year")
+    end_year: int = Query(..., title="End year"),
+    response_format: ResponseFormat = Query(ResponseFormat.JSON, alias="format", title="json, ndjson or csv"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_basics_repository.get_titles_by_date_range(start_year, end_year)
\ No newline at end of file
+    if response_format != ResponseFormat.JSON:
+        query = title_basics_repository.by_date_range_query(start_year, end_year)
+        return stream_response(query, response_format, f"títulos lançados entre {start_year} e {end_year}")
+    return await title_basics_repository.get_titles_by_date_range(db, start_year, end_year)
\ No newline at end of file
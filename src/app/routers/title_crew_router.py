@@ -1,7 +1,13 @@
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status, Path,Query
+from fastapi import APIRouter, HTTPException, status, Path,Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.database import get_async_db
+from src.app.core.etag import list_cache_control
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
+from src.app.dtos.TitleCrewDto import TitleCrewDto
 from src.app.models.title_crew import TitleCrew
 from src.app.repositories.title_crew_repository import TitleCrewRepository
 
@@ -10,17 +16,29 @@ title_crew_router = APIRouter(prefix="/api/title_crew", tags=["Title Crew"])
 title_crew_repository = TitleCrewRepository()
 
 
-@title_crew_router.post("/", response_model=TitleCrew, status_code=status.HTTP_201_CREATED)
-def create_title_crew(title_crew: TitleCrew):
+@title_crew_router.post("/", response_model=TitleCrewDto, status_code=status.HTTP_201_CREATED)
+async def create_title_crew(title_crew: TitleCrew, db: AsyncSession = Depends(get_async_db)):
+    try:
+        return await title_crew_repository.create(db, title_crew)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@title_crew_router.get("/keyset/", response_model=CursorPaginationResultDto[TitleCrewDto], dependencies=[Depends(list_cache_control)])
+async def get_title_crew_keyset(
+    cursor: Optional[str] = Query(None, title="next_cursor returned by the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
     try:
-        return title_crew_repository.create(title_crew)
+        return await title_crew_repository.get_all_keyset(db, cursor, limit)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@title_crew_router.get("/{tconst}", response_model=Optional[TitleCrew])
-def get_title_crew_by_tconst(tconst: str = Path(..., title="The tconst of the title crew to get")):
-    title_crew = title_crew_repository.get_by_tconst(tconst)
+@title_crew_router.get("/{tconst}", response_model=Optional[TitleCrewDto])
+async def get_title_crew_by_tconst(tconst: str = Path(..., title="The tconst of the title crew to get"), db: AsyncSession = Depends(get_async_db)):
+    title_crew = await title_crew_repository.get_by_tconst(db, tconst)
     if not title_crew:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="TitleCrew não encontrado"
@@ -28,9 +46,9 @@ def get_title_crew_by_tconst(tconst: str = Path(..., title="The tconst of the ti
     return title_crew
 
 
-@title_crew_router.put("/{tconst}", response_model=Optional[TitleCrew])
-def update_title_crew(tconst: str = Path(..., title="The tconst of the title crew to update"), title_crew: TitleCrew = None):
-    updated_title_crew = title_crew_repository.update(tconst, title_crew)
+@title_crew_router.put("/{tconst}", response_model=Optional[TitleCrewDto])
+async def update_title_crew(tconst: str = Path(..., title="The tconst of the title crew to update"), title_crew: TitleCrew = None, db: AsyncSession = Depends(get_async_db)):
+    updated_title_crew = await title_crew_repository.update(db, tconst, title_crew)
     if not updated_title_crew:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="TitleCrew não encontrado"
@@ -39,17 +57,18 @@ def update_title_crew(tconst: str = Path(..., title="The tconst of the title cre
 
 
 @title_crew_router.delete("/{tconst}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_title_crew(tconst: str):
-    deleted = title_crew_repository.delete(tconst)
+async def delete_title_crew(tconst: str, db: AsyncSession = Depends(get_async_db)):
+    deleted = await title_crew_repository.delete(db, tconst)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="TitleCrew não encontrado"
         )
     return None
 
-@title_crew_router.get("/", response_model=PaginationResultDto)
-def get_all_title_crew(
+@title_crew_router.get("/", response_model=PaginationResultDto[TitleCrewDto], dependencies=[Depends(list_cache_control)])
+async def get_all_title_crew(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_crew_repository.get_all(page, limit)
\ No newline at end of file
+    return await title_crew_repository.get_all(db, page, limit)
\ No newline at end of file
@@ -1,7 +1,13 @@
-from typing import Optional, List
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status, Path,Query
+from fastapi import APIRouter, HTTPException, status, Path,Query, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.database import get_async_db
+from src.app.core.etag import list_cache_control
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
+from src.app.dtos.TitlePrincipalsDto import TitlePrincipalsDto
 from src.app.models.title_principals import TitlePrincipals
 from src.app.repositories.title_principals_repository import TitlePrincipalsRepository
 
@@ -10,17 +16,29 @@ title_principals_router = APIRouter(prefix="/api/title_principals", tags=["Title
 title_principals_repository = TitlePrincipalsRepository()
 
 
-@title_principals_router.post("/", response_model=TitlePrincipals, status_code=status.HTTP_201_CREATED)
-def create_title_principals(title_principals: TitlePrincipals):
+@title_principals_router.post("/", response_model=TitlePrincipalsDto, status_code=status.HTTP_201_CREATED)
+async def create_title_principals(title_principals: TitlePrincipals, db: AsyncSession = Depends(get_async_db)):
     try:
-        return title_principals_repository.create(title_principals)
+        return await title_principals_repository.create(db, title_principals)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
 
-@title_principals_router.get("/{tconst}/{ordering}", response_model=Optional[TitlePrincipals])
-def get_title_principals_by_tconst_and_ordering(tconst: str = Path(..., title="The tconst of the title principals to get"), ordering: int = Path(..., title="The ordering of the title principals to get")):
-    title_principals = title_principals_repository.get_by_tconst_and_ordering(tconst, ordering)
+@title_principals_router.get("/keyset/", response_model=CursorPaginationResultDto[TitlePrincipalsDto], dependencies=[Depends(list_cache_control)])
+async def get_title_principals_keyset(
+    cursor: Optional[str] = Query(None, title="next_cursor returned by the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await title_principals_repository.get_all_keyset(db, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@title_principals_router.get("/{tconst}/{ordering}", response_model=Optional[TitlePrincipalsDto])
+async def get_title_principals_by_tconst_and_ordering(tconst: str = Path(..., title="The tconst of the title principals to get"), ordering: int = Path(..., title="The ordering of the title principals to get"), db: AsyncSession = Depends(get_async_db)):
+    title_principals = await title_principals_repository.get_by_tconst_and_ordering(db, tconst, ordering)
     if not title_principals:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="TitlePrincipals não encontrado"
@@ -28,9 +46,9 @@ def get_title_principals_by_tconst_and_ordering(tconst: str = Path(..., title="T
     return title_principals
 
 
-@title_principals_router.put("/{tconst}/{ordering}", response_model=Optional[TitlePrincipals])
-def update_title_principals(tconst: str = Path(..., title="The tconst of the title principals to update"), ordering: int = Path(..., title="The ordering of the title principals to update"), title_principals: TitlePrincipals = None):
-    updated_title_principals = title_principals_repository.update(tconst, ordering, title_principals)
+@title_principals_router.put("/{tconst}/{ordering}", response_model=Optional[TitlePrincipalsDto])
+async def update_title_principals(tconst: str = Path(..., title="The tconst of the title principals to update"), ordering: int = Path(..., title="The ordering of the title principals to update"), title_principals: TitlePrincipals = None, db: AsyncSession = Depends(get_async_db)):
+    updated_title_principals = await title_principals_repository.update(db, tconst, ordering, title_principals)
     if not updated_title_principals:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="TitlePrincipals não encontrado"
@@ -39,17 +57,18 @@ def update_title_principals(tconst: str = Path(..., title="The tconst of the tit
 
 
 @title_principals_router.delete("/{tconst}/{ordering}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_title_principals(tconst: str, ordering: int):
-    deleted = title_principals_repository.delete(tconst, ordering)
+async def delete_title_principals(tconst: str, ordering: int, db: AsyncSession = Depends(get_async_db)):
+    deleted = await title_principals_repository.delete(db, tconst, ordering)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="TitlePrincipals não encontrado"
         )
     return None
 
-@title_principals_router.get("/", response_model=PaginationResultDto)
-def get_all_title_principals(
+@title_principals_router.get("/", response_model=PaginationResultDto[TitlePrincipalsDto], dependencies=[Depends(list_cache_control)])
+async def get_all_title_principals(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_principals_repository.get_all(page, limit)
+    return await title_principals_repository.get_all(db, page, limit)
@@ -1,9 +1,17 @@
 from typing import Optional, List
 
-from fastapi import APIRouter, HTTPException, status, Query, Path
+from fastapi import APIRouter, HTTPException, status, Query, Path, Depends, Request, Response
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.database import get_async_db
+from src.app.core.etag import conditional_get, list_cache_control
+from src.app.core.streaming import ResponseFormat, stream_response
 from src.app.models.title_ratings import TitleRatings
+from src.app.dtos.CursorPaginationResultDto import CursorPaginationResultDto
 from src.app.dtos.PaginationResultDto import PaginationResultDto
+from src.app.dtos.TitleRatingsDto import TitleRatingsDto
+from src.app.dtos.RatingStatsDto import RatingStatsDto
 from src.app.repositories.title_ratings_repository import TitleRatingsRepository
 
 title_ratings_router = APIRouter(prefix="/api/ratings", tags=["Title Ratings"])
@@ -11,17 +19,65 @@ title_ratings_router = APIRouter(prefix="/api/ratings", tags=["Title Ratings"])
 title_ratings_repository = TitleRatingsRepository()
 
 
-@title_ratings_router.post("/", response_model=TitleRatings, status_code=status.HTTP_201_CREATED)
-def create_rating(rating: TitleRatings):
+@title_ratings_router.post("/", response_model=TitleRatingsDto, status_code=status.HTTP_201_CREATED)
+async def create_rating(rating: TitleRatings, db: AsyncSession = Depends(get_async_db)):
     try:
-        return title_ratings_repository.create(rating)
+        return await title_ratings_repository.create(db, rating)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@title_ratings_router.get("/{tconst}", response_model=Optional[TitleRatings])
-def get_rating_by_tconst(tconst: str = Path(..., title="The ID of the title to get rating for")):
-    rating = title_ratings_repository.get_by_tconst(tconst)
+@title_ratings_router.get("/keyset/", response_model=CursorPaginationResultDto[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_ratings_keyset(
+    cursor: Optional[str] = Query(None, title="next_cursor returned by the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await title_ratings_repository.get_all_keyset(db, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@title_ratings_router.get("/above/keyset/", response_model=CursorPaginationResultDto[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_ratings_above_keyset(
+    min_rating: float = Query(..., ge=0, le=10, title="Minimum rating"),
+    cursor: Optional[str] = Query(None, title="next_cursor returned by the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await title_ratings_repository.get_ratings_above_keyset(db, min_rating, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@title_ratings_router.get("/by-votes/keyset/", response_model=CursorPaginationResultDto[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_ratings_by_votes_keyset(
+    min_votes: int = Query(..., ge=0, title="Minimum number of votes"),
+    cursor: Optional[str] = Query(None, title="next_cursor returned by the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await title_ratings_repository.get_ratings_by_votes_keyset(db, min_votes, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@title_ratings_router.get("/{tconst}", response_model=Optional[TitleRatingsDto])
+async def get_rating_by_tconst(
+    request: Request,
+    response: Response,
+    tconst: str = Path(..., title="The ID of the title to get rating for"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rating = await conditional_get(
+        request,
+        response,
+        lambda: title_ratings_repository.get_version(db, tconst),
+        lambda: title_ratings_repository.get_versioned(db, tconst),
+    )
     if not rating:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Avaliação não encontrada"
@@ -29,13 +85,14 @@ def get_rating_by_tconst(tconst: str = Path(..., title="The ID of the title to g
     return rating
 
 
-@title_ratings_router.put("/{tconst}", response_model=Optional[TitleRatings])
-def update_rating(
+@title_ratings_router.put("/{tconst}", response_model=Optional[TitleRatingsDto])
+async def update_rating(
     tconst: str = Path(..., title="The ID of the title to update rating for"),
     averageRating: float = Query(..., ge=0, le=10, title="New average rating"),
     numVotes: int = Query(..., ge=0, title="New number of votes"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    updated_rating = title_ratings_repository.update(tconst, averageRating, numVotes)
+    updated_rating = await title_ratings_repository.update(db, tconst, averageRating, numVotes)
     if not updated_rating:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Avaliação não encontrada"
@@ -44,8 +101,8 @@ def update_rating(
 
 
 @title_ratings_router.delete("/{tconst}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_rating(tconst: str = Path(..., title="The ID of the title to delete rating for")):
-    deleted = title_ratings_repository.delete(tconst)
+async def delete_rating(tconst: str = Path(..., title="The ID of the title to delete rating for"), db: AsyncSession = Depends(get_async_db)):
+    deleted = await title_ratings_repository.delete(db, tconst)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Avaliação não encontrada"
@@ -53,39 +110,62 @@ def delete_rating(tconst: str = Path(..., title="The ID of the title to delete r
     return None
 
 
-@title_ratings_router.get("/above/", response_model=PaginationResultDto)
-def get_ratings_above(
+@title_ratings_router.get("/above/", response_model=PaginationResultDto[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_ratings_above(
     min_rating: float = Query(..., ge=0, le=10, title="Minimum rating"),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_ratings_repository.get_ratings_above(min_rating, page, limit)
+    return await title_ratings_repository.get_ratings_above(db, min_rating, page, limit)
 
 
-@title_ratings_router.get("/by-votes/", response_model=PaginationResultDto)
-def get_ratings_by_votes(
+@title_ratings_router.get("/by-votes/", response_model=PaginationResultDto[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_ratings_by_votes(
     min_votes: int = Query(..., ge=0, title="Minimum number of votes"),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    return title_ratings_repository.get_ratings_by_votes(min_votes, page, limit)
+    return await title_ratings_repository.get_ratings_by_votes(db, min_votes, page, limit)
 
-@title_ratings_router.get("/top-voted/")
-def get_top_n_voted(n: int = Query(10, ge=1, le=100, title="Number of top voted titles to retrieve")):
-    return title_ratings_repository.get_top_n_voted(n)
+@title_ratings_router.get("/top-voted/", response_model=List[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_top_n_voted(n: int = Query(10, ge=1, le=100, title="Number of top voted titles to retrieve"), db: AsyncSession = Depends(get_async_db)):
+    return await title_ratings_repository.get_top_n_voted(db, n)
 
-@title_ratings_router.get("/highest-rated/")
-def get_highest_rated(n: int = Query(10, ge=1, le=100, title="Number of highest rated titles to retrieve")):
-    return title_ratings_repository.get_highest_rated(n)
+@title_ratings_router.get("/highest-rated/", response_model=List[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_highest_rated(n: int = Query(10, ge=1, le=100, title="Number of highest rated titles to retrieve"), db: AsyncSession = Depends(get_async_db)):
+    return await title_ratings_repository.get_highest_rated(db, n)
 
-@title_ratings_router.get("/average-by-title-type/")
-def get_average_rating_by_title_type(title_type: str = Query(..., title="Type of the title to average rating")):
-    return title_ratings_repository.get_average_rating_by_title_type(title_type)
+@title_ratings_router.get("/average-by-title-type/", response_model=RatingStatsDto, dependencies=[Depends(list_cache_control)])
+async def get_average_rating_by_title_type(title_type: str = Query(..., title="Type of the title to average rating"), db: AsyncSession = Depends(get_async_db)):
+    stats = await title_ratings_repository.get_average_rating_by_title_type(db, title_type)
+    if not stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhuma avaliação encontrada para o tipo"
+        )
+    return stats
 
-@title_ratings_router.get("/average-by-director/")
-def get_average_rating_by_director(director_name: str = Query(..., title="Name of the director to average rating")):
-    return title_ratings_repository.get_average_rating_by_director(director_name)
+@title_ratings_router.get("/average-by-director/", response_model=List[RatingStatsDto], dependencies=[Depends(list_cache_control)])
+async def get_average_rating_by_director(director_name: str = Query(..., title="Name of the director to average rating"), db: AsyncSession = Depends(get_async_db)):
+    return await title_ratings_repository.get_average_rating_by_director(db, director_name)
+
+@title_ratings_router.get("/stats/{dimension}", response_model=List[RatingStatsDto], dependencies=[Depends(list_cache_control)])
+async def get_rating_stats(
+    dimension: str = Path(..., title="title_type, genre, decade or director"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await title_ratings_repository.get_rating_stats(db, dimension, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-@title_ratings_router.get("/", response_model=List[TitleRatings])
-def get_all_ratings():
-    return title_ratings_repository.get_all()
\ No newline at end of file
+@title_ratings_router.get("/", response_model=List[TitleRatingsDto], dependencies=[Depends(list_cache_control)])
+async def get_all_ratings(
+    response_format: ResponseFormat = Query(ResponseFormat.JSON, alias="format", title="json, ndjson or csv"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if response_format != ResponseFormat.JSON:
+        return stream_response(title_ratings_repository.all_query(), response_format, "todas as avaliações")
+    return await title_ratings_repository.get_all(db)
\ No newline at end of file
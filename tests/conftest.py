@@ -0,0 +1,14 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.app.core.db.database import engine
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Pula o teste quando o banco configurado não está acessível."""
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        pytest.skip("banco de dados não configurado ou inacessível")
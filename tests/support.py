@@ -0,0 +1,15 @@
+import asyncio
+
+from src.app.core.db.database import async_engine
+
+
+def run(coroutine):
+    """Executa coroutine em um loop de eventos novo e fecha as conexões do asyncpg, presas a esse loop."""
+
+    async def wrapper():
+        try:
+            return await coroutine
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(wrapper())
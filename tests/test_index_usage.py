@@ -0,0 +1,131 @@
+"""Confere com EXPLAIN que as consultas dos repositórios usam os índices esperados.
+
+Cada teste executa a consulta contra o banco configurado, captura o SQL emitido
+e pede o plano de cada comando com enable_seqscan desligado: assim o resultado
+não depende do tamanho das tabelas, só de existir um índice aplicável. Sem
+banco acessível os testes são pulados.
+"""
+import json
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, select
+
+from src.app.core.db.database import async_engine, local_async_session
+from src.app.core.leaderboard import rating_leaderboard, votes_leaderboard
+from src.app.models.title_principals import TitlePrincipals
+from src.app.repositories.name_basics_repository import NameBasicsRepository
+from src.app.repositories.title_basics_repository import TitleBasicsRepository
+from src.app.repositories.title_ratings_repository import TitleRatingsRepository
+from tests.support import run
+
+titles = TitleBasicsRepository()
+names = NameBasicsRepository()
+ratings = TitleRatingsRepository()
+
+
+async def principals_by_nconst(db):
+    return (await db.scalars(select(TitlePrincipals).where(TitlePrincipals.nconst == "nm0000001"))).all()
+
+
+# (consulta, chamada, {tabela: índice que precisa aparecer no plano})
+CHECKS = [
+    ("TitleBasicsRepository.get_titles_by_date_range", lambda db: titles.get_titles_by_date_range(db, 1990, 1995),
+     {"title_basics": "ix_title_basics_startYear"}),
+    ("TitleBasicsRepository.get_by_genre", lambda db: titles.get_by_genre(db, "Drama"),
+     {"title_genre": "ix_title_genre_genre"}),
+    ("TitleBasicsRepository.get_titles_by_director", lambda db: titles.get_titles_by_director(db, "Kubrick"),
+     {"title_crew_member": "ix_title_crew_member_nconst_role", "name_basics": "ix_name_basics_primaryname_trgm"}),
+    ("TitleBasicsRepository.search_by_title", lambda db: titles.search_by_title(db, "Matrix"),
+     {"title_basics": "ix_title_basics_primarytitle_trgm"}),
+    ("NameBasicsRepository.search_by_name", lambda db: names.search_by_name(db, "Kubrick"),
+     {"name_basics": "ix_name_basics_primaryname_trgm"}),
+    ("TitleRatingsRepository.get_ratings_above", lambda db: ratings.get_ratings_above(db, 9.5),
+     {"title_ratings": "ix_title_ratings_averageRating_tconst"}),
+    ("TitleRatingsRepository.get_ratings_above_keyset", lambda db: ratings.get_ratings_above_keyset(db, 9.5),
+     {"title_ratings": "ix_title_ratings_averageRating_tconst"}),
+    ("TitleRatingsRepository.get_ratings_by_votes", lambda db: ratings.get_ratings_by_votes(db, 1_000_000),
+     {"title_ratings": "ix_title_ratings_numVotes_tconst"}),
+    ("TitleRatingsRepository.get_ratings_by_votes_keyset", lambda db: ratings.get_ratings_by_votes_keyset(db, 1_000_000),
+     {"title_ratings": "ix_title_ratings_numVotes_tconst"}),
+    # O top-N é servido da memória; a consulta ao índice acontece na reconstrução do ranking
+    ("rating_leaderboard.build", rating_leaderboard.build,
+     {"title_ratings": "ix_title_ratings_averageRating_tconst"}),
+    ("votes_leaderboard.build", votes_leaderboard.build,
+     {"title_ratings": "ix_title_ratings_numVotes_tconst"}),
+    ("TitleRatingsRepository.get_average_rating_by_title_type", lambda db: ratings.get_average_rating_by_title_type(db, "movie"),
+     {"rating_stats": "ix_rating_stats_dimension_key"}),
+    ("TitleRatingsRepository.get_average_rating_by_director", lambda db: ratings.get_average_rating_by_director(db, "Kubrick"),
+     {"rating_stats": "ix_rating_stats_dimension_key", "name_basics": "ix_name_basics_primaryname_trgm"}),
+    ("NameBasics.principals (busca por nconst)", principals_by_nconst,
+     {"title_principals": "ix_title_principals_nconst"}),
+]
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    # Os eventos de cursor da engine assíncrona são emitidos pela engine síncrona que ela envolve
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def scans(connection, statement: str, parameters) -> list:
+    """(tipo do nó, tabela, índice) de cada leitura de tabela no plano do comando."""
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    # O asyncpg devolve o json como texto
+    plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+    return [
+        (node["Node Type"], node.get("Relation Name"), node.get("Index Name"))
+        for node in plan_nodes(plan)
+        if "Scan" in node["Node Type"] and (node.get("Relation Name") or node.get("Index Name"))
+    ]
+
+
+async def index_tables(connection) -> dict:
+    rows = await connection.exec_driver_sql(
+        "SELECT indexname, tablename FROM pg_indexes WHERE schemaname = current_schema()"
+    )
+    return dict(rows.all())
+
+
+async def plan_scans(call) -> list:
+    """(tipo do nó, tabela, índice) de todas as leituras feitas pelos comandos de call."""
+    with captured_statements() as statements:
+        async with local_async_session() as db:
+            await call(db)
+
+    found = []
+    async with async_engine.connect() as connection:
+        await connection.exec_driver_sql("SET enable_seqscan = off")
+        owners = await index_tables(connection)
+        for statement, parameters in statements:
+            for node_type, relation, index in await scans(connection, statement, parameters):
+                found.append((node_type, relation or owners.get(index), index))
+    return found
+
+
+@pytest.mark.parametrize("call, expected", [pytest.param(call, expected, id=name) for name, call, expected in CHECKS])
+def test_query_uses_expected_indexes(database, call, expected):
+    found = run(plan_scans(call))
+
+    sequential = sorted({table for node_type, table, _ in found if node_type == "Seq Scan" and table in expected})
+    assert not sequential, f"leitura sequencial em {', '.join(sequential)}"
+
+    used = {index for _, table, index in found if table in expected and index}
+    for table, index in expected.items():
+        assert index in used, f"{table} não usou {index}; índices no plano: {sorted(used)}"
@@ -0,0 +1,48 @@
+"""Validação dos cursores da paginação por keyset; não precisa de banco."""
+import asyncio
+
+import pytest
+
+from src.app.core.db.rows import select_columns
+from src.app.core.pagination import decode_cursor, encode_cursor, keyset_page
+from src.app.dtos.TitleRatingsDto import TitleRatingsDto
+from src.app.models.title_ratings import TitleRatings
+
+VOTES_KEYS = [TitleRatings.numVotes, TitleRatings.tconst]
+RATING_KEYS = [TitleRatings.averageRating, TitleRatings.tconst]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([1_000_000, "tt0111161"])
+
+    assert decode_cursor(cursor, VOTES_KEYS) == [1_000_000, "tt0111161"]
+
+
+def test_integer_cursor_value_is_accepted_for_float_key():
+    assert decode_cursor(encode_cursor([9, "tt0111161"]), RATING_KEYS) == [9, "tt0111161"]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["muitos", "tt0111161"],
+        [[1], "tt0111161"],
+        [{"votos": 1}, "tt0111161"],
+        [True, "tt0111161"],
+        [1_000_000, 111161],
+        [None, "tt0111161"],
+        [1_000_000],
+    ],
+    ids=["texto", "lista", "objeto", "booleano", "chave-numerica", "nulo", "tamanho"],
+)
+def test_cursor_with_wrong_value_is_rejected(values):
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        decode_cursor(encode_cursor(values), VOTES_KEYS)
+
+
+def test_keyset_page_rejects_mistyped_cursor_before_querying():
+    # Sem sessão: o cursor precisa ser recusado antes de qualquer consulta
+    cursor = encode_cursor(["9.5", "tt0111161"])
+
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        asyncio.run(keyset_page(None, select_columns(TitleRatings), RATING_KEYS, cursor, 10, TitleRatingsDto))
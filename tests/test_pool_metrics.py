@@ -0,0 +1,40 @@
+"""waiters do pool: só conta retiradas bloqueadas à espera de uma conexão; usa SQLite, sem o banco configurado."""
+import threading
+import time
+
+from sqlalchemy import create_engine
+
+from src.app.core.db.pool_metrics import InstrumentedQueuePool, PoolMetrics
+
+
+def test_waiters_counts_only_blocked_checkouts(monkeypatch):
+    metrics = PoolMetrics()
+    monkeypatch.setattr(InstrumentedQueuePool, "metrics", metrics)
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=5,
+        connect_args={"check_same_thread": False},
+    )
+    try:
+        # Conexão livre: a retirada não espera
+        engine.connect().close()
+        assert metrics.waiters == 0
+
+        held = engine.connect()
+        assert metrics.waiters == 0
+
+        blocked = threading.Thread(target=lambda: engine.connect().close())
+        blocked.start()
+        deadline = time.monotonic() + 2
+        while metrics.waiters == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert metrics.waiters == 1
+
+        held.close()
+        blocked.join(timeout=5)
+        assert metrics.waiters == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,15 @@
+"""Cabeçalhos das exportações em NDJSON e CSV; a resposta é montada sem ler o banco."""
+import pytest
+
+from src.app.core.db.rows import select_columns
+from src.app.core.etag import list_cache_header
+from src.app.core.streaming import ResponseFormat, stream_response
+from src.app.models.title_basics import TitleBasics
+
+
+@pytest.mark.parametrize("response_format", [ResponseFormat.NDJSON, ResponseFormat.CSV])
+def test_streamed_export_keeps_list_cache_control(response_format):
+    response = stream_response(select_columns(TitleBasics), response_format, "títulos")
+
+    assert response.headers["cache-control"] == list_cache_header()
+    assert response.headers["content-type"].startswith(response.media_type)
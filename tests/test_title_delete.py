@@ -0,0 +1,56 @@
+"""Remoção de um título avaliado: a avaliação sai junto (ON DELETE CASCADE) e deixa os rankings."""
+from sqlalchemy import delete
+
+from src.app.core.db.database import local_async_session
+from src.app.core.leaderboard import leaderboards
+from src.app.models.title_basics import TitleBasics
+from src.app.models.title_ratings import TitleRatings
+from src.app.repositories.title_basics_repository import TitleBasicsRepository
+from src.app.repositories.title_ratings_repository import TitleRatingsRepository
+from tests.support import run
+
+TCONST = "tt9999999999"
+
+titles = TitleBasicsRepository()
+ratings = TitleRatingsRepository()
+
+
+async def ranked(tconst: str) -> list:
+    async with local_async_session() as db:
+        return [tconst in {row.tconst for row in await leaderboard.get(db, leaderboard.capacity)} for leaderboard in leaderboards]
+
+
+async def delete_rated_title() -> dict:
+    async with local_async_session() as db:
+        # Sobra de uma execução interrompida
+        await db.execute(delete(TitleBasics).where(TitleBasics.tconst == TCONST))
+        await db.commit()
+
+    try:
+        async with local_async_session() as db:
+            title = TitleBasics(tconst=TCONST, titleType="movie", primaryTitle="Teste", originalTitle="Teste", isAdult=False)
+            await titles.create(db, title)
+            # Nota e votos máximos: a avaliação entra no topo dos dois rankings
+            await ratings.create(db, TitleRatings(tconst=TCONST, averageRating=10.0, numVotes=2_000_000_000))
+            await db.commit()
+        before = await ranked(TCONST)
+
+        async with local_async_session() as db:
+            deleted = await titles.delete(db, TCONST)
+            await db.commit()
+        async with local_async_session() as db:
+            rating = await db.get(TitleRatings, TCONST)
+        return {"before": before, "deleted": deleted, "rating": rating, "after": await ranked(TCONST)}
+    finally:
+        async with local_async_session() as db:
+            await db.execute(delete(TitleBasics).where(TitleBasics.tconst == TCONST))
+            await db.commit()
+
+
+def test_deleting_rated_title_removes_it_from_leaderboards(database):
+    result = run(delete_rated_title())
+
+    assert result["before"] == [True, True]
+    assert result["deleted"] is True
+    assert result["rating"] is None
+    assert result["after"] == [False, False]